@@ -8,8 +8,7 @@ import os.path
 import socket
 from datetime import UTC, datetime, timedelta, timezone
 from json.decoder import JSONDecodeError
-from pprint import pprint as pp
-from typing import Any, Dict, List, Optional
+from typing import Dict, List, Optional
 
 import aiofiles
 
@@ -20,7 +19,7 @@ import numpy as np  # from retry_requests import retry
 # import requests_cache
 import pandas as pd
 from aiohttp import ClientSession, ClientTimeout
-from aiohttp.client import ClientResponseError, ClientSession
+from aiohttp.client import ClientResponseError
 from aiohttp.client_exceptions import ClientError
 from typeguard import typechecked
 
@@ -38,6 +37,7 @@ from pyastroweatherio.const import (
     DEFAULT_CONDITION_SEEING_WEIGHT,
     DEFAULT_CONDITION_TRANSPARENCY_WEIGHT,
     DEFAULT_ELEVATION,
+    DEFAULT_FORECAST_HOURS,
     DEFAULT_LATITUDE,
     DEFAULT_LONGITUDE,
     DEFAULT_TIMEOUT,
@@ -106,6 +106,7 @@ class AstroWeather:
         forecast_model=None,
     ):
         self._session: ClientSession = session
+        self._close_session = False
         self._location_data = self._get_location(
             latitude,
             longitude,
@@ -116,6 +117,8 @@ class AstroWeather:
         self._weather_data_uptonight_bodies = {}
         self._weather_data_uptonight_comets = {}
         self._weather_data_timestamp = datetime.now() - timedelta(seconds=(DEFAULT_CACHE_TIMEOUT + 1))
+        # Created on first use, before Python 3.10 a lock binds to the loop current at creation
+        self._retrieve_lock = None
         self._cloudcover_weight = cloudcover_weight
         self._cloudcover_high_weakening = cloudcover_high_weakening
         self._cloudcover_medium_weakening = cloudcover_medium_weakening
@@ -165,10 +168,10 @@ class AstroWeather:
         return await self._get_location_data()
 
     @typechecked
-    async def get_hourly_forecast(self) -> List[ForecastData]:
+    async def get_hourly_forecast(self, hours_to_show=DEFAULT_FORECAST_HOURS) -> List[ForecastData]:
         """Returns hourly Weather Forecast."""
 
-        return await self._get_forecast_data(FORECAST_TYPE_HOURLY, 72)
+        return await self._get_forecast_data(FORECAST_TYPE_HOURLY, hours_to_show)
 
     @typechecked
     async def get_deepsky_forecast(self) -> List[NightlyConditionsData]:
@@ -176,6 +179,22 @@ class AstroWeather:
 
         return await self._get_deepsky_forecast()
 
+    async def __aenter__(self) -> "AstroWeather":
+        """Opens a session shared by all requests unless one was passed in."""
+
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(timeout=ClientTimeout(total=DEFAULT_TIMEOUT))
+            self._close_session = True
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Closes the session if it was opened by the context manager."""
+
+        if self._close_session:
+            await self._session.close()
+            self._session = None
+            self._close_session = False
+
     # #########################################################################
     # Private functions
     # #########################################################################
@@ -238,86 +257,91 @@ class AstroWeather:
     async def _retrive_data(self) -> None:
         """Retrieves current data from all data sources."""
 
-        if ((datetime.now() - self._weather_data_timestamp).total_seconds()) > DEFAULT_CACHE_TIMEOUT:
-            self._weather_data_timestamp = datetime.now()
+        # Concurrent callers wait for a running retrieval instead of finding the
+        # cache timestamp renewed while the weather data is still being built
+        if self._retrieve_lock is None:
+            self._retrieve_lock = asyncio.Lock()
+        async with self._retrieve_lock:
+            if ((datetime.now() - self._weather_data_timestamp).total_seconds()) > DEFAULT_CACHE_TIMEOUT:
+                self._weather_data_timestamp = datetime.now()
 
-            weather_df_metno = await self._retrieve_data_metno()
-            weather_df_seventimer = await self._retrieve_data_seventimer()
-            await self._retrieve_data_uptonight()
+                weather_df_metno = await self._retrieve_data_metno()
+                weather_df_seventimer = await self._retrieve_data_seventimer()
+                await self._retrieve_data_uptonight()
 
-            if self._forecast_model is not None:
-                weather_df_openmeteo = await self._retrieve_data_openmeteo()
+                if self._forecast_model is not None:
+                    weather_df_openmeteo = await self._retrieve_data_openmeteo()
 
-                # Merge the dataframes of metno, seventimer, and openmeteo
-                self._weather_df = weather_df_metno.merge(weather_df_seventimer, on="time", how="left").merge(
-                    weather_df_openmeteo, on="time", how="left"
-                )
+                    # Merge the dataframes of metno, seventimer, and openmeteo
+                    self._weather_df = weather_df_metno.merge(weather_df_seventimer, on="time", how="left").merge(
+                        weather_df_openmeteo, on="time", how="left"
+                    )
 
-                # Overwrite met.no forecast with open-meteo forcast
-                self._weather_df["cloud_area_fraction"] = self._weather_df["openmeteo_cloud_cover"]
-                self._weather_df["cloud_area_fraction_high"] = self._weather_df["openmeteo_cloud_cover_high"]
-                self._weather_df["cloud_area_fraction_medium"] = self._weather_df["openmeteo_cloud_cover_mid"]
-                self._weather_df["cloud_area_fraction_low"] = self._weather_df["openmeteo_cloud_cover_low"]
-                self._weather_df["relative_humidity"] = self._weather_df["openmeteo_relative_humidity_2m"]
-                self._weather_df["wind_speed"] = self._weather_df["openmeteo_wind_speed_10m"]
-                self._weather_df["wind_from_direction"] = self._weather_df["openmeteo_wind_direction_10m"]
-                self._weather_df["air_temperature"] = self._weather_df["openmeteo_temperature_2m"]
-                self._weather_df["dew_point_temperature"] = self._weather_df["openmeteo_dew_point_2m"]
-                self._weather_df["precipitation_amount"] = self._weather_df["openmeteo_precipitation"]
-                self._weather_df = self._weather_df.drop(
-                    [
-                        "openmeteo_cloud_cover",
-                        "openmeteo_cloud_cover_high",
-                        "openmeteo_cloud_cover_mid",
-                        "openmeteo_cloud_cover_low",
-                        "openmeteo_relative_humidity_2m",
-                        "openmeteo_wind_speed_10m",
-                        "openmeteo_wind_direction_10m",
-                        "openmeteo_temperature_2m",
-                        "openmeteo_dew_point_2m",
-                        "openmeteo_precipitation",
-                    ],
-                    axis=1,
-                )
-            else:
-                # Merge the dataframes of metno and seventimer
-                self._weather_df = weather_df_metno.merge(weather_df_seventimer, on="time", how="left")
-
-            # Clean up rows with missing values
-            self._weather_df = self._weather_df.dropna(subset=["air_temperature"])
-            self._weather_df = self._weather_df.dropna(subset=["next_6h_symbol_code"])
-
-            self._weather_df["time_diff"] = self._weather_df["time"].diff()
-            threshold = pd.Timedelta(hours=1)
-            cutoff_index = self._weather_df[self._weather_df["time_diff"] > threshold].index.min()
-            if pd.notna(cutoff_index):  # Check if there's a cutoff
-                self._weather_df = self._weather_df.loc[: cutoff_index - 1]
-            self._weather_df = self._weather_df.drop(columns=["time_diff"])
-
-            # Check if we got dew point temperatures. If not calculate them.
-            has_nan_or_none = self._weather_df["dew_point_temperature"].isnull().any()
-            if has_nan_or_none:
-                _LOGGER.warning(
-                    f"Column 'dew_point_temperature' has NaN or None: {has_nan_or_none}. Calculating dew points."
-                )
-                self._weather_df["dew_point_temperature"] = await self._calculate_dew_point(self._weather_df)
-
-            # Should we try to calculate seeing, transparency, and lifted_index?
-            if self._experimental_features:
-                # Calculate atmosphere
-                self._weather_df["seeing"] = await self._calculate_seeing(self._weather_df)
-                self._weather_df["transparency"] = await self._calculate_transparency(self._weather_df)
-                self._weather_df["lifted_index"] = await self._calculate_lifted_index(self._weather_df)
+                    # Overwrite met.no forecast with open-meteo forcast
+                    self._weather_df["cloud_area_fraction"] = self._weather_df["openmeteo_cloud_cover"]
+                    self._weather_df["cloud_area_fraction_high"] = self._weather_df["openmeteo_cloud_cover_high"]
+                    self._weather_df["cloud_area_fraction_medium"] = self._weather_df["openmeteo_cloud_cover_mid"]
+                    self._weather_df["cloud_area_fraction_low"] = self._weather_df["openmeteo_cloud_cover_low"]
+                    self._weather_df["relative_humidity"] = self._weather_df["openmeteo_relative_humidity_2m"]
+                    self._weather_df["wind_speed"] = self._weather_df["openmeteo_wind_speed_10m"]
+                    self._weather_df["wind_from_direction"] = self._weather_df["openmeteo_wind_direction_10m"]
+                    self._weather_df["air_temperature"] = self._weather_df["openmeteo_temperature_2m"]
+                    self._weather_df["dew_point_temperature"] = self._weather_df["openmeteo_dew_point_2m"]
+                    self._weather_df["precipitation_amount"] = self._weather_df["openmeteo_precipitation"]
+                    self._weather_df = self._weather_df.drop(
+                        [
+                            "openmeteo_cloud_cover",
+                            "openmeteo_cloud_cover_high",
+                            "openmeteo_cloud_cover_mid",
+                            "openmeteo_cloud_cover_low",
+                            "openmeteo_relative_humidity_2m",
+                            "openmeteo_wind_speed_10m",
+                            "openmeteo_wind_direction_10m",
+                            "openmeteo_temperature_2m",
+                            "openmeteo_dew_point_2m",
+                            "openmeteo_precipitation",
+                        ],
+                        axis=1,
+                    )
+                else:
+                    # Merge the dataframes of metno and seventimer
+                    self._weather_df = weather_df_metno.merge(weather_df_seventimer, on="time", how="left")
+
+                # Clean up rows with missing values
+                self._weather_df = self._weather_df.dropna(subset=["air_temperature"])
+                self._weather_df = self._weather_df.dropna(subset=["next_6h_symbol_code"])
+
+                self._weather_df["time_diff"] = self._weather_df["time"].diff()
+                threshold = pd.Timedelta(hours=1)
+                cutoff_index = self._weather_df[self._weather_df["time_diff"] > threshold].index.min()
+                if pd.notna(cutoff_index):  # Check if there's a cutoff
+                    self._weather_df = self._weather_df.loc[: cutoff_index - 1]
+                self._weather_df = self._weather_df.drop(columns=["time_diff"])
+
+                # Check if we got dew point temperatures. If not calculate them.
+                has_nan_or_none = self._weather_df["dew_point_temperature"].isnull().any()
+                if has_nan_or_none:
+                    _LOGGER.warning(
+                        f"Column 'dew_point_temperature' has NaN or None: {has_nan_or_none}. Calculating dew points."
+                    )
+                    self._weather_df["dew_point_temperature"] = await self._calculate_dew_point(self._weather_df)
+
+                # Should we try to calculate seeing, transparency, and lifted_index?
+                if self._experimental_features:
+                    # Calculate atmosphere
+                    self._weather_df["seeing"] = await self._calculate_seeing(self._weather_df)
+                    self._weather_df["transparency"] = await self._calculate_transparency(self._weather_df)
+                    self._weather_df["lifted_index"] = await self._calculate_lifted_index(self._weather_df)
+                else:
+                    # 7Timer delivers three hourly data only, so we fill the missing data here
+                    self._weather_df["seeing"] = self._weather_df["seeing"].ffill()
+                    self._weather_df["transparency"] = self._weather_df["transparency"].ffill()
+                    self._weather_df["lifted_index"] = self._weather_df["lifted_index"].ffill()
+                    self._weather_df["seeing"] = self._weather_df["seeing"].bfill()
+                    self._weather_df["transparency"] = self._weather_df["transparency"].bfill()
+                    self._weather_df["lifted_index"] = self._weather_df["lifted_index"].bfill()
             else:
-                # 7Timer delivers three hourly data only, so we fill the missing data here
-                self._weather_df["seeing"] = self._weather_df["seeing"].ffill()
-                self._weather_df["transparency"] = self._weather_df["transparency"].ffill()
-                self._weather_df["lifted_index"] = self._weather_df["lifted_index"].ffill()
-                self._weather_df["seeing"] = self._weather_df["seeing"].bfill()
-                self._weather_df["transparency"] = self._weather_df["transparency"].bfill()
-                self._weather_df["lifted_index"] = self._weather_df["lifted_index"].bfill()
-        else:
-            _LOGGER.debug("Using cached data")
+                _LOGGER.debug("Using cached data")
 
     @typechecked
     def _get_location(
@@ -502,9 +526,9 @@ class AstroWeather:
         now = datetime.now(UTC).replace(tzinfo=None)
 
         if self._test_datetime is not None:
-            await self._astro_routines.need_update()
+            self._astro_routines.need_update()
         else:
-            await self._astro_routines.need_update(forecast_time=now)
+            self._astro_routines.need_update(forecast_time=now)
 
         forecast_time = now.replace(minute=0, second=0, microsecond=0)
         if self._test_datetime is not None:
@@ -535,16 +559,16 @@ class AstroWeather:
                 # Time data
                 "time_data": time_data,
                 # Time shift to UTC
-                "time_shift": await self._astro_routines.time_shift(),
+                "time_shift": self._astro_routines.time_shift(),
                 # Remaining forecast data point in met.no data
                 "forecast_length": (len(self._weather_df) - data_index),
                 # Location
                 "location_data": self._location_data,
                 # Astronomical routines
-                "sun_data": await self._astro_routines.sun_data(),
-                "moon_data": await self._astro_routines.moon_data(),
-                "darkness_data": await self._astro_routines.darkness_data(),
-                "night_duration_astronomical": await self._astro_routines.night_duration_astronomical(),
+                "sun_data": self._astro_routines.sun_data(),
+                "moon_data": self._astro_routines.moon_data(),
+                "darkness_data": self._astro_routines.darkness_data(),
+                "night_duration_astronomical": self._astro_routines.night_duration_astronomical(),
                 "deepsky_forecast": await self._get_deepsky_forecast(),
                 "condition_data": await self._get_condition(now),
                 # Uptonight objects
@@ -583,7 +607,7 @@ class AstroWeather:
         _LOGGER.debug("Forecast time: %s", str(forecast_time))
 
         utc_to_local_diff = self._astro_routines.utc_to_local_diff()
-        _LOGGER.debug("UTC to local diff: %s", str(utc_to_local_diff))
+        _LOGGER.debug("UTC to local diff: %s", utc_to_local_diff)
 
         if len(self._weather_df) == 0:
             _LOGGER.error("Weather data not available")
@@ -622,10 +646,13 @@ class AstroWeather:
                 _LOGGER.error(ve)
 
             cnt += 1
-            if cnt >= hours_to_show:
+            if cnt >= max(hours_to_show, DEFAULT_FORECAST_HOURS):
                 break
 
-        self._forecast_data = items
+        # The deep sky forecast is always built from a forecast of the default length,
+        # so every hourly request refreshes it regardless of the hours shown
+        self._forecast_data = items[:DEFAULT_FORECAST_HOURS]
+        items = items[:hours_to_show]
 
         _LOGGER.debug("Forceast Length: %s", str(len(items)))
 
@@ -638,10 +665,10 @@ class AstroWeather:
         items = []
 
         if self._forecast_data is None:
-            await self._get_forecast_data(FORECAST_TYPE_HOURLY, 72)
+            await self._get_forecast_data(FORECAST_TYPE_HOURLY, DEFAULT_FORECAST_HOURS)
 
         utc_to_local_diff = self._astro_routines.utc_to_local_diff()
-        _LOGGER.debug("UTC to local diff: %s", str(utc_to_local_diff))
+        _LOGGER.debug("UTC to local diff: %s", utc_to_local_diff)
 
         # Create forecast
         forecast_dayname = ""
@@ -651,13 +678,13 @@ class AstroWeather:
         now = datetime.now(UTC).replace(tzinfo=None)
 
         if self._test_datetime is not None:
-            await self._astro_routines.need_update()
+            self._astro_routines.need_update()
         else:
-            await self._astro_routines.need_update(forecast_time=now)
+            self._astro_routines.need_update(forecast_time=now)
 
-        sun_next_setting = await self._astro_routines.sun_next_setting()
-        sun_next_rising = await self._astro_routines.sun_next_rising()
-        night_duration_astronomical = await self._astro_routines.night_duration_astronomical()
+        sun_next_setting = self._astro_routines.sun_next_setting()
+        sun_next_rising = self._astro_routines.sun_next_rising()
+        night_duration_astronomical = self._astro_routines.night_duration_astronomical()
 
         start_indexes = []
         # Find start index for two nights and store the indexes
@@ -763,7 +790,7 @@ class AstroWeather:
                 dataseries_dso = json.loads(contents)
                 _LOGGER.debug("Uptonight DSO imported")
             else:
-                _LOGGER.debug(f"File uptonight-report.json not found in {self._uptonight_path}")
+                _LOGGER.debug("File uptonight-report.json not found in %s", self._uptonight_path)
 
             if os.path.isfile(self._uptonight_path + "/uptonight-bodies-report.json"):
                 # _LOGGER.debug(f"Uptonight report found")
@@ -772,7 +799,7 @@ class AstroWeather:
                 dataseries_bodies = json.loads(contents)
                 _LOGGER.debug("Uptonight Bodies imported")
             else:
-                _LOGGER.debug(f"File uptonight-bodies-report.json not found in {self._uptonight_path}")
+                _LOGGER.debug("File uptonight-bodies-report.json not found in %s", self._uptonight_path)
 
             if os.path.isfile(self._uptonight_path + "/uptonight-comets-report.json"):
                 # _LOGGER.debug(f"Uptonight report found")
@@ -781,10 +808,10 @@ class AstroWeather:
                 dataseries_comets = json.loads(contents)
                 _LOGGER.debug("Uptonight Comets imported")
             else:
-                _LOGGER.debug(f"File uptonight-comets-report.json not found in {self._uptonight_path}")
+                _LOGGER.debug("File uptonight-comets-report.json not found in %s", self._uptonight_path)
         else:
             _LOGGER.debug(
-                f"Path for UpTonight data not found. Current path: {self._uptonight_path}/uptonight-report.json"
+                "Path for UpTonight data not found. Current path: %s/uptonight-report.json", self._uptonight_path
             )
 
         self._weather_data_uptonight = dataseries_dso
@@ -809,12 +836,14 @@ class AstroWeather:
             dso_meridian_antitransit = self._weather_data_uptonight.get("meridian antitransit", {})
             dso_foto = self._weather_data_uptonight.get("foto", {})
 
+            # UpTonight times are local, the offset is the same for every row
+            time_shift = timedelta(seconds=self._astro_routines.time_shift())
+
             for row in range(len(dso_target_name)):
                 dso_meridian_transit_local = dso_meridian_transit.get(str(row), "")
                 if dso_meridian_transit_local != "":
                     dso_meridian_transit_utc = (
-                        datetime.strptime(dso_meridian_transit_local, "%m/%d/%Y %H:%M:%S")
-                        - timedelta(seconds=await self._astro_routines.time_shift())
+                        datetime.strptime(dso_meridian_transit_local, "%m/%d/%Y %H:%M:%S") - time_shift
                     ).replace(tzinfo=UTC)
                 else:
                     dso_meridian_transit_utc = ""
@@ -822,8 +851,7 @@ class AstroWeather:
                 dso_meridian_antitransit_local = dso_meridian_antitransit.get(str(row), "")
                 if dso_meridian_antitransit_local != "":
                     dso_meridian_antitransit_utc = (
-                        datetime.strptime(dso_meridian_antitransit_local, "%m/%d/%Y %H:%M:%S")
-                        - timedelta(seconds=await self._astro_routines.time_shift())
+                        datetime.strptime(dso_meridian_antitransit_local, "%m/%d/%Y %H:%M:%S") - time_shift
                     ).replace(tzinfo=UTC)
                 else:
                     dso_meridian_antitransit_utc = ""
@@ -865,13 +893,15 @@ class AstroWeather:
             body_meridian_transit = self._weather_data_uptonight_bodies.get("meridian transit", {})
             body_foto = self._weather_data_uptonight_bodies.get("foto", {})
 
+            # UpTonight times are local, the offset is the same for every row
+            time_shift = timedelta(seconds=self._astro_routines.time_shift())
+
             for row in range(len(body_target_name)):
                 # UpTonight delivers the time in local time zone. here we need it in UTC
                 body_max_altitude_time_local = body_max_altitude_time.get(str(row), "")
                 if body_max_altitude_time_local != "":
                     body_max_altitude_time_utc = (
-                        datetime.strptime(body_max_altitude_time_local, "%m/%d/%Y %H:%M:%S")
-                        - timedelta(seconds=await self._astro_routines.time_shift())
+                        datetime.strptime(body_max_altitude_time_local, "%m/%d/%Y %H:%M:%S") - time_shift
                     ).replace(tzinfo=UTC)
                 else:
                     body_max_altitude_time_utc = ""
@@ -879,8 +909,7 @@ class AstroWeather:
                 body_meridian_transit_local = body_meridian_transit.get(str(row), "")
                 if body_meridian_transit_local != "":
                     body_meridian_transit_utc = (
-                        datetime.strptime(body_meridian_transit_local, "%m/%d/%Y %H:%M:%S")
-                        - timedelta(seconds=await self._astro_routines.time_shift())
+                        datetime.strptime(body_meridian_transit_local, "%m/%d/%Y %H:%M:%S") - time_shift
                     ).replace(tzinfo=UTC)
                 else:
                     body_meridian_transit_utc = ""
@@ -922,13 +951,15 @@ class AstroWeather:
             rise_time = self._weather_data_uptonight_comets.get("rise time", {})
             set_time = self._weather_data_uptonight_comets.get("set time", {})
 
+            # UpTonight times are local, the offset is the same for every row
+            time_shift = timedelta(seconds=self._astro_routines.time_shift())
+
             for row in range(len(comet_target_name)):
                 # UpTonight delivers the time in local time zone. here we need it in UTC
                 rise_time_local = rise_time.get(str(row), "")
                 if rise_time_local != "":
                     rise_time_local_utc = (
-                        datetime.strptime(rise_time_local, "%m/%d/%Y %H:%M:%S")
-                        - timedelta(seconds=await self._astro_routines.time_shift())
+                        datetime.strptime(rise_time_local, "%m/%d/%Y %H:%M:%S") - time_shift
                     ).replace(tzinfo=UTC)
                 else:
                     rise_time_local_utc = ""
@@ -936,8 +967,7 @@ class AstroWeather:
                 set_time_local = set_time.get(str(row), "")
                 if set_time_local != "":
                     set_time_local_utc = (
-                        datetime.strptime(set_time_local, "%m/%d/%Y %H:%M:%S")
-                        - timedelta(seconds=await self._astro_routines.time_shift())
+                        datetime.strptime(set_time_local, "%m/%d/%Y %H:%M:%S") - time_shift
                     ).replace(tzinfo=UTC)
                 else:
                     set_time_local_utc = ""
@@ -1063,7 +1093,7 @@ class AstroWeather:
             + "&output=json"
         )
         try:
-            _LOGGER.debug(f"Query url: {url}")
+            _LOGGER.debug("Query url: %s", url)
             async with session.request("get", url, headers=HEADERS, ssl=False) as resp:
                 resp.raise_for_status()
                 plain = str(await resp.text()).replace("\n", " ")
@@ -1167,7 +1197,7 @@ class AstroWeather:
         )
 
         try:
-            _LOGGER.debug(f"Query url: {url}")
+            _LOGGER.debug("Query url: %s", url)
             async with session.request("get", url, headers=HEADERS) as resp:
                 resp.raise_for_status()
                 # plain = str(await resp.text()).replace("\n", " ")
@@ -1232,7 +1262,7 @@ class AstroWeather:
         }
 
         try:
-            _LOGGER.debug(f"Query url: {BASE_URL_OPENMETEO}")
+            _LOGGER.debug("Query url: %s", BASE_URL_OPENMETEO)
 
             # async with asyncio.timeout(self.request_timeout):
             response = await session.get(BASE_URL_OPENMETEO, params=params)
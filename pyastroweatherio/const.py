@@ -13,6 +13,7 @@ HEADERS = {"User-Agent": "AstroWeather github.com/mawinkler/astroweather"}
 # #####################################################
 DEFAULT_TIMEOUT = 10
 DEFAULT_CACHE_TIMEOUT = 1770
+DEFAULT_FORECAST_HOURS = 72
 DEFAULT_TIMEZONE = "Etc/UTC"
 DEFAULT_LATITUDE = 0.0
 DEFAULT_LONGITUDE = 0.0
@@ -3,7 +3,6 @@
 import math
 from dataclasses import dataclass
 from datetime import datetime
-from pprint import pprint as pp
 from typing import TypedDict
 
 from typeguard import typechecked
@@ -1,7 +1,10 @@
 """Contains Helper functions for AstroWeather."""
 
+import bisect
 import logging
 import math
+import time
+from dataclasses import dataclass, fields
 from datetime import UTC, datetime, timedelta
 from math import degrees as deg
 
@@ -28,14 +31,139 @@ from pyastroweatherio.dataclasses import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Search window and coarse stride in days for risings and settings beyond a
+# polar day or night. Below 88 degrees latitude the Sun keeps crossing a
+# twilight horizon for at least ten days once it starts doing so. The Moon's
+# declination changes much faster, its crossings may last a single day.
+POLAR_SEARCH_DAYS = 365
+POLAR_SEARCH_STRIDE = {"Sun": 8}
+POLAR_SEARCH_STRIDE_MAX_LATITUDE = 88
+
+# Below 85 degrees latitude the Moon crosses the horizon at least twice per
+# tropical month, so its search does not need to extend beyond a lunation
+POLAR_SEARCH_DAYS_MOON = 31
+POLAR_SEARCH_DAYS_MOON_MAX_LATITUDE = 85
+
+# Declination change in degrees a body may undergo while ephem iterates
+# towards a rising or setting, about a day ahead or back. The Sun's
+# declination changes by at most 0.4 degrees per day, the topocentric
+# declination of the Moon by up to about 8 degrees.
+POLAR_DECLINATION_MARGIN = {"Sun": 1, "Moon": 12}
+
+# Upper bound of the daily declination change in degrees, including the
+# Moon's topocentric parallax
+POLAR_DECLINATION_RATE = {"Sun": 0.5, "Moon": 8}
+
+# Observer horizons in radians. The moon horizon follows the Naval Observatory
+# Risings and Settings at minus 34 arcminutes, https://aa.usno.navy.mil/data/RS_OneDay
+CIVIL_HORIZON = CIVIL_DUSK_DAWN * degree
+NAUTICAL_HORIZON = NAUTICAL_DUSK_DAWN * degree
+ASTRONOMICAL_HORIZON = ASTRONOMICAL_DUSK_DAWN * degree
+MOON_HORIZON = ephem.degrees("-0:34")
+
+# Raised by ephem for a body that does not cross the horizon of the day
+CIRCUMPOLAR_ERRORS = (ephem.AlwaysUpError, ephem.NeverUpError)
+
+# Lifetime of the cached UTC offset of the location
+UTC_OFFSET_CACHE_SECONDS = 3600
+
+# Barometric formula of the standard atmosphere
+LAPSE_RATE = -0.0065  # Temperature lapse rate in K/m
+TEMPERATURE_SEA_LEVEL = 288.15  # Temperature at sea level in K
+GRAVITY = 9.80665  # Acceleration due to gravity in m/s^2
+MOLAR_MASS_AIR = 0.02896  # Molar mass of Earth's air in kg/mol
+GAS_CONSTANT = 8.31447  # Universal gas constant in J/(mol*K)
+PRESSURE_LAPSE_FACTOR = LAPSE_RATE / TEMPERATURE_SEA_LEVEL
+PRESSURE_EXPONENT = (GRAVITY * MOLAR_MASS_AIR) / (GAS_CONSTANT * LAPSE_RATE)  # ~ -5.2558
+
+# Magnus-Tetens coefficients, Monteith and Unsworth (2008) for temperatures above 0 °C
+MAGNUS_A = 17.27
+MAGNUS_B = 237.3
+MAGNUS_E0 = 0.61078
+
+# Mixing ratio and lifting condensation level coefficients
+MIXING_RATIO_A = 621.97
+LCL_A = 2440
+LCL_B = 0.00029
+
+# Transparency at and below which -log(transparency) reaches one and the
+# magnitude degradation is clamped to MAG_DEGRATION_MAX
+MAG_DEGRATION_SATURATION = math.exp(-1)
+
+# Moon distance and size
+AU_KM = 149597870.7  # 1 AU in km
+RAD_TO_DEG = 57.29578  # 180 / pi
+MOON_AVG_DISTANCE_KM = 384400  # Average distance of the Moon from Earth in km
+MOON_AVG_ANGULAR_SIZE = 0.5181  # Average angular size in degrees
+
+# Day zero of ephem dates
+EPHEM_EPOCH = datetime(1899, 12, 31, 12, tzinfo=UTC)
+
+
+def _to_utc(ephem_date) -> datetime:
+    """Converts an ephem date into an aware UTC datetime."""
+
+    return EPHEM_EPOCH + timedelta(days=float(ephem_date))
+
+
+def _state_to_model(state) -> dict:
+    """Returns the assigned fields of a sun or moon state as a model dict."""
+
+    return {
+        field.name: getattr(state, field.name)
+        for field in fields(state)
+        if getattr(state, field.name) is not None
+    }
+
+
+@dataclass(slots=True)
+class _SunState:
+    """Working copy of the sun data, converted to a SunDataModel on output."""
+
+    altitude: float | None = None
+    azimuth: float | None = None
+    next_rising_astro: datetime | None = None
+    next_rising_civil: datetime | None = None
+    next_rising_nautical: datetime | None = None
+    next_setting_astro: datetime | None = None
+    next_setting_civil: datetime | None = None
+    next_setting_nautical: datetime | None = None
+    previous_rising_astro: datetime | None = None
+    previous_setting_astro: datetime | None = None
+    constellation: str | None = None
+
+
+@dataclass(slots=True)
+class _MoonState:
+    """Working copy of the moon data, converted to a MoonDataModel on output."""
+
+    altitude: float | None = None
+    angular_size: float | None = None
+    avg_angular_size: float | None = None
+    avg_distance_km: float | None = None
+    azimuth: float | None = None
+    distance: float | None = None
+    distance_km: float | None = None
+    next_full_moon: datetime | None = None
+    next_new_moon: datetime | None = None
+    next_rising: datetime | None = None
+    next_setting: datetime | None = None
+    phase: float | None = None
+    previous_rising: datetime | None = None
+    previous_setting: datetime | None = None
+    relative_distance: float | None = None
+    relative_size: float | None = None
+    constellation: str | None = None
+
 
 class ConversionFunctions:
     """Convert between different units."""
 
-    async def epoch_to_datetime(self, value) -> str:
-        """Converts EPOC time to Date Time String."""
+    @staticmethod
+    def epoch_to_datetime(value) -> str:
+        """Converts EPOC time to UTC Date Time String."""
 
-        return datetime.datetime.fromtimestamp(int(value)).strftime("%Y-%m-%d %H:%M:%S")
+        return datetime.fromtimestamp(int(value), tz=UTC).strftime("%Y-%m-%d %H:%M:%S")
 
     async def anchor_timestamp(self, value) -> datetime:
         """Converts the datetime string from 7Timer to DateTime."""
@@ -66,19 +194,19 @@ class AtmosphericRoutines:
     # #####################################################
     @typechecked
     async def calculate_lifted_index(
-        self, temperature, altitude, dew_point_temperature, air_pressure_at_sea_level
+        self, temperature, altitude, dew_point_temperature, air_pressure_at_sea_level, vapor_pressure=None
     ) -> None | float:
-        """Calculate atmospheric lifted index."""
+        """Calculate atmospheric lifted index.
+
+        A vapor pressure at the dew point already calculated by the caller can be passed in.
+        """
         # https://en.wikipedia.org/wiki/Lifted_index
 
-        if not all(
-            v is not None
-            for v in [
-                temperature,
-                altitude,
-                dew_point_temperature,
-                air_pressure_at_sea_level,
-            ]
+        if (
+            temperature is None
+            or altitude is None
+            or dew_point_temperature is None
+            or air_pressure_at_sea_level is None
         ):
             return None
 
@@ -91,7 +219,10 @@ class AtmosphericRoutines:
 
         # Calculate actual Vapor Pressure at surface
         # Checked with https://www.weather.gov/epz/wxcalc_vaporpressure
-        e = self._calculate_vapor_pressure(dew_point_temperature)  # 6.112 * (10 ** (7.5 * (Td - Tn) / (Td - 35.85)))
+        # 6.112 * (10 ** (7.5 * (Td - Tn) / (Td - 35.85)))
+        e = vapor_pressure
+        if e is None:
+            e = self._calculate_vapor_pressure(dew_point_temperature)
 
         # Calculate Mixing Ratio at Surface in grams per kilogram
         # Checked with https://www.weather.gov/epz/wxcalc_mixingratio
@@ -153,22 +284,22 @@ class AtmosphericRoutines:
         - seeing: In Arcsecs
         """
 
-        if not all(
-            v is not None
-            for v in [
-                temperature,
-                humidity,
-                cloud_cover,
-                wind_speed,
-                altitude,
-                dew_point_temperature,
-                air_pressure_at_sea_level,
-            ]
+        if (
+            temperature is None
+            or humidity is None
+            or cloud_cover is None
+            or wind_speed is None
+            or altitude is None
+            or dew_point_temperature is None
+            or air_pressure_at_sea_level is None
         ):
             return None
 
+        # Both the lifted index and the seeing need the vapor pressure at the dew point
+        vapor_pressure = self._calculate_vapor_pressure(dew_point_temperature)
+
         lifted_index = await self.calculate_lifted_index(
-            temperature, altitude, dew_point_temperature, air_pressure_at_sea_level
+            temperature, altitude, dew_point_temperature, air_pressure_at_sea_level, vapor_pressure
         )
         seeing = await self.calculate_seeing(
             temperature,
@@ -178,6 +309,7 @@ class AtmosphericRoutines:
             cloud_cover,
             altitude,
             air_pressure_at_sea_level,
+            vapor_pressure,
         )
 
         # Calculate transparency
@@ -218,6 +350,7 @@ class AtmosphericRoutines:
         cloud_cover,
         altitude,
         air_pressure_at_sea_level,
+        vapor_pressure=None,
     ) -> None | float:
         """
         Calculated seeing of the atmosphere. This algorithm first calculates the seeing factor based on temperature,
@@ -235,6 +368,7 @@ class AtmosphericRoutines:
         - cloud_cover: Cloud cover in Percent.
         - altitude: Altitude in meters.
         - air_pressure_at_sea_level: Air pressure at sea level.
+        - vapor_pressure: Vapor pressure at the dew point if already calculated (optional).
 
         Returns:
         - seeing: In Arcsecs
@@ -247,24 +381,21 @@ class AtmosphericRoutines:
         - seeing
         """
 
-        if not all(
-            v is not None
-            for v in [
-                temperature,
-                humidity,
-                dew_point_temperature,
-                wind_speed,
-                cloud_cover,
-                altitude,
-                air_pressure_at_sea_level,
-            ]
+        if (
+            temperature is None
+            or humidity is None
+            or dew_point_temperature is None
+            or wind_speed is None
+            or cloud_cover is None
+            or altitude is None
+            or air_pressure_at_sea_level is None
         ):
             return None
 
         # Constants
         C = 6.5  # 1.7
 
-        water_vapor_pressure = self._calculate_water_vapor_pressure(dew_point_temperature, humidity)
+        water_vapor_pressure = self._calculate_water_vapor_pressure(dew_point_temperature, humidity, vapor_pressure)
 
         # adjusted_pressure = air_pressure_at_sea_level * math.exp(-0.00012 * altitude)
         adjusted_pressure = self._calculate_adjusted_pressure(air_pressure_at_sea_level, altitude)
@@ -396,15 +527,10 @@ class AtmosphericRoutines:
         Calculate the adjusted pressure at a given altitude above sea level.
         """
 
-        lapse_rate = -0.0065  # Temperature lapse rate in K/m
-        temperature_sea_level = 288.15  # Temperature at sea level in K
-        gravity = 9.80665  # Acceleration due to gravity in m/s^2
-        molar_mass_air = 0.02896  # Molar mass of Earth's air in kg/mol
-        gas_constant = 8.31447  # Universal gas constant in J/(mol*K)
-
-        pressure_adjusted = pressure_sea_level * (1 - (lapse_rate * altitude) / temperature_sea_level) ** (
-            (gravity * molar_mass_air) / (gas_constant * lapse_rate)
-        )
+        # (1 + x) ** k evaluated as exp(k * log1p(x)), which stays accurate for the small
+        # ratios of typical site altitudes
+        lapse_ratio = -PRESSURE_LAPSE_FACTOR * altitude
+        pressure_adjusted = pressure_sea_level * math.exp(PRESSURE_EXPONENT * math.log1p(lapse_ratio))
 
         return pressure_adjusted
 
@@ -439,21 +565,17 @@ class AtmosphericRoutines:
         # A = 17.62
         # B = 243.12
 
-        # # Monteith and Unsworth (2008) provide Tetens' formula for temperatures above 0 °C
-        A = 17.27
-        B = 237.3
-
         # Murray (1967) provides Tetens' equation for temperatures below 0 °C
         # A = 21.875
         # B = 265.5
 
         # Calculate vapor pressure using Magnus-Tetens formula
-        e = 0.61078 * math.exp((A * temperature) / (temperature + B))
+        e = MAGNUS_E0 * math.exp((MAGNUS_A * temperature) / (temperature + MAGNUS_B))
 
         return e
 
     @typechecked
-    def _calculate_water_vapor_pressure(self, dew_point_temperature, humidity) -> float:
+    def _calculate_water_vapor_pressure(self, dew_point_temperature, humidity, vapor_pressure=None) -> float:
         """
         Calculate the water vapor pressure based on temperature and humidity.
 
@@ -462,12 +584,15 @@ class AtmosphericRoutines:
         Args:
         - dew_point_temperature: Dew point temperature in Celsius.
         - humidity: Humidity in Percent.
+        - vapor_pressure: Vapor pressure at the dew point if already calculated (optional).
 
         Returns:
         - water_vapor_pressure: Water vapor pressure at the surface in millibars (mb) or hectopascals (hPa).
         """
 
-        es = self._calculate_vapor_pressure(dew_point_temperature)
+        es = vapor_pressure
+        if es is None:
+            es = self._calculate_vapor_pressure(dew_point_temperature)
         water_vapor_pressure = (humidity / 100) * es
 
         return water_vapor_pressure
@@ -487,11 +612,8 @@ class AtmosphericRoutines:
         - w: mixing ratio at surface in grams per kilogram
         """
 
-        # Constants
-        A = 621.97
-
         # Calculate actual vapor pressure using Magnus-Tetens formula
-        w = A * (e / (air_pressure_at_sea_level - e))
+        w = MIXING_RATIO_A * e / (air_pressure_at_sea_level - e)
 
         return w
 
@@ -514,12 +636,8 @@ class AtmosphericRoutines:
         - lcl: LCL in meters
         """
 
-        # Constants
-        A = 2440
-        B = 0.00029
-
         # Calculate Lifting Condensation Level using the Clausius-Clapeyron equation
-        lcl = (A * w) / ((air_pressure_at_sea_level - w) * (1 - B * air_pressure_at_sea_level))
+        lcl = (LCL_A * w) / ((air_pressure_at_sea_level - w) * (1 - LCL_B * air_pressure_at_sea_level))
 
         return lcl
 
@@ -617,7 +735,8 @@ class AtmosphericRoutines:
         - magniture_degradation: In magnitude.
         """
 
-        if transparency == 0:
+        # The degradation saturates at or below the threshold, no need for the logarithm
+        if transparency <= MAG_DEGRATION_SATURATION:
             return float(MAG_DEGRATION_MAX)
         magnitude_degradation = -MAG_DEGRATION_MAX * math.log(transparency)
         magnitude_degradation = max(0, min(MAG_DEGRATION_MAX, magnitude_degradation))
@@ -626,7 +745,11 @@ class AtmosphericRoutines:
 
 
 class AstronomicalRoutines:
-    """Calculate different astronomical objects."""
+    """Calculate different astronomical objects.
+
+    The calculations are CPU bound ephem calls without any I/O, so the
+    methods are synchronous.
+    """
 
     def __init__(
         self,
@@ -637,51 +760,79 @@ class AstronomicalRoutines:
         self._test_mode = False
 
         _LOGGER.debug("Timezone: %s", self._location_data.timezone_info)
+        self._tz = ZoneInfo(self._location_data.timezone_info)
+        self._utc_offset_cache = None
         if forecast_time is None:
             self._forecast_time = datetime.now(UTC).replace(tzinfo=UTC)
         else:
             self._forecast_time = forecast_time.replace(tzinfo=UTC)
             self._test_mode = True
 
-        self._sun_observer = None
-        self._sun_observer_nautical = None
-        self._sun_observer_astro = None
-        self._moon_observer = None
-        self._sun = None
-        self._moon = None
-        self._sun_data = {}
-        self._moon_data = {}
+        # The location is static, so the observers and bodies are created once
+        # and only their date is moved along with the forecast time
+        self._sun_observer = self._get_sun_observer(CIVIL_HORIZON)
+        self._sun_observer_nautical = self._get_sun_observer(NAUTICAL_HORIZON)
+        self._sun_observer_astro = self._get_sun_observer(ASTRONOMICAL_HORIZON)
+        self._moon_observer = self._get_moon_observer()
+        self._sun = ephem.Sun()
+        self._moon = ephem.Moon()
+        self._sun_data = _SunState()
+        self._moon_data = _MoonState()
         self._darkness_data = {}
 
+        # Last risings and settings found per horizon, body and event
+        self._event_cache = {}
+
+        # Forecast times the bodies were last computed for, per body name
+        self._body_computed_at = {}
+
+        # Forecast times the sun and moon data were last calculated for
+        self._sun_calculated_for = None
+        self._moon_calculated_for = None
+
+        # Darkness states with the forecast time of the data they were derived from
+        self._astronomical_darkness_cache = None
+        self._moon_down_cache = None
+
         # Internal only
         self._sun_previous_rising_astro = None
         self._sun_previous_setting_astro = None
 
     def _test_data(self, data, keys) -> bool:
-        """Test that specific values in a dictionary are not None"""
+        """Test that specific values of a sun or moon state are not None"""
 
-        if not all(data[key] is not None for key in keys):
-            return False
+        for key in keys:
+            if getattr(data, key) is None:
+                return False
         return True
 
     def utc_to_local_diff(self) -> float:
         """Returns the UTC Offset."""
 
+        # The offset only changes on DST transitions, so it is reused for an hour
+        if self._utc_offset_cache is not None:
+            cached_at, offset = self._utc_offset_cache
+            if time.monotonic() - cached_at < UTC_OFFSET_CACHE_SECONDS:
+                return offset
+
         # Get the current time in the specified timezone
-        now = datetime.now(ZoneInfo(self._location_data.timezone_info))
+        now = datetime.now(self._tz)
 
         # Get the offset in seconds
         offset_seconds = now.utcoffset().total_seconds()
 
         # Convert the offset to hours
-        return offset_seconds / 3600
+        offset = offset_seconds / 3600
+        self._utc_offset_cache = (time.monotonic(), offset)
+
+        return offset
 
-    async def time_shift(self) -> float:
+    def time_shift(self) -> float:
         """Returns the time_shift to UTC in hours."""
 
         return int(self.utc_to_local_diff() * 3600)
 
-    async def need_update(self, forecast_time=None) -> None:
+    def need_update(self, forecast_time=None) -> None:
         """Update Sun and Moon."""
 
         if forecast_time is not None:
@@ -695,16 +846,16 @@ class AstronomicalRoutines:
     # Observers
     #
     @typechecked
-    def _get_sun_observer(self, below_horizon=ASTRONOMICAL_DUSK_DAWN) -> ephem.Observer:
+    def _get_sun_observer(self, horizon=ASTRONOMICAL_HORIZON) -> ephem.Observer:
         """Retrieves the ephem sun observer for the current location."""
 
         observer = ephem.Observer()
         observer.lon = str(self._location_data.longitude)  # * degree
         observer.lat = str(self._location_data.latitude)  # * degree
         observer.elevation = self._location_data.elevation
-        observer.horizon = below_horizon * degree
+        observer.horizon = horizon
         observer.pressure = 0
-        observer.epoch = datetime.now().strftime("%Y/%m/%d")
+        observer.epoch = ephem.J2000
 
         return observer
 
@@ -717,22 +868,183 @@ class AstronomicalRoutines:
         observer.lat = str(self._location_data.latitude)  # * degree
         observer.elevation = self._location_data.elevation
         # Naval Observatory Risings and Settings
-        # Set horizon to minus 34 arcminutes
-        # https://aa.usno.navy.mil/data/RS_OneDay
-        observer.horizon = "-0:34"
+        observer.horizon = MOON_HORIZON
         observer.pressure = 0
-        observer.epoch = datetime.now().strftime("%Y/%m/%d")
+        observer.epoch = ephem.J2000
 
         return observer
 
+    def _compute_at_forecast_time(self, body, observer) -> None:
+        """Computes the body for the forecast time unless it already is."""
+
+        if self._body_computed_at.get(body.name) != self._forecast_time:
+            observer.date = self._forecast_time
+            body.compute(observer)
+            self._body_computed_at[body.name] = self._forecast_time
+
+    #
+    # Polar day and night
+    #
+    def _find_event(self, observer, event, body, use_center=False) -> datetime | None:
+        """Finds a rising or setting, searching beyond a polar day or night if necessary.
+
+        Args:
+        - observer: The observer.
+        - event: One of next_rising, next_setting, previous_rising, or previous_setting.
+        - body: The ephem body.
+        - use_center: Use the center of the body instead of its upper limb.
+
+        Returns:
+        - The event in UTC or None if there is no event within a year.
+        """
+
+        # The body is computed for other dates from here on
+        self._body_computed_at.pop(body.name, None)
+
+        gap = self._event_horizon_gap(observer, body, use_center)
+        if gap <= 0:
+            try:
+                # A body close to grazing the horizon crosses it so flatly that ephem
+                # settles on an event depending on the date it starts from. A cached
+                # event may have been found a day earlier, so it is reused only while
+                # the horizon stays within reach by the margin for another day of
+                # declination change.
+                if gap <= -self._event_reuse_clearance(body):
+                    return self._cached_event(observer, event, body, use_center)
+                return _to_utc(getattr(observer, event)(body, use_center=use_center))
+            except CIRCUMPOLAR_ERRORS:
+                pass
+
+        return self._search_event(observer, event, body, use_center)
+
+    def _cached_event(self, observer, event, body, use_center=False) -> datetime:
+        """Returns a rising or setting, reusing the last one found for the same horizon and body.
+
+        A next event found from some date stays the next event for every later date
+        before it. A previous event stays the previous event for every date after it up
+        to the next event of its kind, or up to the date it was found from.
+        """
+
+        date = float(observer.date)
+        horizon = float(observer.horizon)
+        cached = self._event_cache.get((horizon, body.name, event, use_center))
+        if cached is not None:
+            start, event_date = cached
+            if event.startswith("next"):
+                hit = start <= date < event_date
+            else:
+                end = start
+                upcoming = self._event_cache.get((horizon, body.name, event.replace("previous", "next"), use_center))
+                if upcoming is not None and upcoming[0] <= start < upcoming[1]:
+                    end = upcoming[1]
+                hit = event_date < date < end or date == start
+            if hit:
+                return _to_utc(event_date)
+
+        event_date = getattr(observer, event)(body, use_center=use_center)
+        self._event_cache[(horizon, body.name, event, use_center)] = (date, float(event_date))
+
+        return _to_utc(event_date)
+
+    def _event_reuse_clearance(self, body) -> float:
+        """Returns the horizon gap in radians below which cached events of the body are reused."""
+
+        return (POLAR_DECLINATION_MARGIN.get(body.name, 90) + POLAR_DECLINATION_RATE.get(body.name, 90)) * degree
+
+    def _event_horizon_gap(self, observer, body, use_center=False) -> float:
+        """Returns how far the horizon is out of reach of the body around the observer's date.
+
+        A body crosses the horizon during a day only if the horizon lies in between the
+        lowest and highest altitude of its daily circle. The range is widened by the
+        declination change the body can undergo until ephem settles on the event.
+
+        Returns:
+        - The distance of the horizon from the widened range in radians, zero or less if
+          the body may cross the horizon. A positive gap reliably means that ephem would
+          raise an AlwaysUpError or NeverUpError.
+        """
+
+        body.compute(observer)
+        horizon = observer.horizon
+        if not use_center:
+            horizon -= body.radius
+        margin = POLAR_DECLINATION_MARGIN.get(body.name, 90) * degree
+        lowest = abs(observer.lat + body.dec) - math.pi / 2
+        highest = math.pi / 2 - abs(observer.lat - body.dec)
+
+        return max(lowest - margin - horizon, horizon - highest - margin)
+
+    def _search_event(self, observer, event, body, use_center=False) -> datetime | None:
+        """Searches a rising or setting beyond a polar day or night.
+
+        Equivalent to stepping day by day through the year until the event
+        can be found, but the day is bisected within a coarse stride and days
+        on which the body can't reach the horizon are skipped.
+
+        Args:
+        - observer: The observer, its date is left at the day the event was found.
+        - event: One of next_rising, next_setting, previous_rising, or previous_setting.
+        - body: The ephem body.
+        - use_center: Use the center of the body instead of its upper limb.
+
+        Returns:
+        - The event in UTC or None if there is no event within the search window.
+        """
+
+        find_event = getattr(observer, event)
+        direction = -1 if event.startswith("previous") else 1
+        start = observer.date.datetime()
+
+        rate = POLAR_DECLINATION_RATE.get(body.name, 90) * degree
+
+        def days_without_event(days) -> int | None:
+            """Probes the given day, returns None if the event is found there.
+
+            Otherwise returns the number of days on either side of it, which can't
+            have the event either, since the declination can't bridge the gap faster.
+            """
+
+            observer.date = start + timedelta(days=direction * days)
+            gap = self._event_horizon_gap(observer, body, use_center)
+            if gap > 0:
+                return max(0, int(gap / rate) - 1)
+            try:
+                find_event(body, use_center=use_center)
+            except CIRCUMPOLAR_ERRORS:
+                return 0
+            return None
+
+        def event_found(days) -> bool:
+            return days_without_event(days) is None
+
+        latitude = abs(self._location_data.latitude)
+        stride = 1
+        if latitude < POLAR_SEARCH_STRIDE_MAX_LATITUDE:
+            stride = POLAR_SEARCH_STRIDE.get(body.name, 1)
+        search_days = POLAR_SEARCH_DAYS
+        if body.name == "Moon" and latitude < POLAR_SEARCH_DAYS_MOON_MAX_LATITUDE:
+            search_days = POLAR_SEARCH_DAYS_MOON
+        lower = 0
+        while lower < search_days:
+            upper = min(lower + stride, search_days)
+            skip = days_without_event(upper)
+            if skip is None:
+                days = bisect.bisect_left(range(lower + 1, upper + 1), True, key=event_found) + lower + 1
+                observer.date = start + timedelta(days=direction * days)
+                _LOGGER.debug("%s %s at horizon %s in %s days.", body.name, event, observer.horizon, days)
+                return _to_utc(find_event(body, use_center=use_center))
+            lower = upper + skip
+
+        return None
+
     # #########################################################################
     # Sun
     # #########################################################################
     @typechecked
-    async def sun_data(self) -> SunData:
+    def sun_data(self) -> SunData:
         """Returns sun data."""
 
-        sd = SunDataModel(self._sun_data)
+        sd = SunDataModel(_state_to_model(self._sun_data))
         try:
             return SunData(data=sd)
         except TypeError as ve:
@@ -740,7 +1052,7 @@ class AstronomicalRoutines:
             _LOGGER.error(ve)
             return None
 
-    async def sun_next_rising(self) -> datetime:
+    def sun_next_rising(self) -> datetime:
         """Returns sun next rising."""
 
         if (
@@ -748,21 +1060,21 @@ class AstronomicalRoutines:
                 self._sun_data,
                 ["next_rising_astro", "next_rising_nautical", "next_rising_civil"],
             )
-            or self._forecast_time > self._sun_data["next_rising_astro"]
-            or self._forecast_time > self._sun_data["next_rising_nautical"]
-            or self._forecast_time > self._sun_data["next_rising_civil"]
+            or self._forecast_time > self._sun_data.next_rising_astro
+            or self._forecast_time > self._sun_data.next_rising_nautical
+            or self._forecast_time > self._sun_data.next_rising_civil
         ):
             _LOGGER.debug("Astronomical calculations updating sun_next_rising")
             self._calculate_sun()
 
-        if self._sun_data.get("next_rising_astro", None) is not None:
-            return self._sun_data["next_rising_astro"]
-        if self._sun_data.get("next_rising_nautical", None) is not None:
-            return self._sun_data["next_rising_nautical"]
-        if self._sun_data.get("next_rising_civil", None) is not None:
-            return self._sun_data["next_rising_civil"]
+        if self._sun_data.next_rising_astro is not None:
+            return self._sun_data.next_rising_astro
+        if self._sun_data.next_rising_nautical is not None:
+            return self._sun_data.next_rising_nautical
+        if self._sun_data.next_rising_civil is not None:
+            return self._sun_data.next_rising_civil
 
-    async def sun_next_setting(self) -> datetime:
+    def sun_next_setting(self) -> datetime:
         """Returns sun next setting."""
 
         if (
@@ -770,286 +1082,105 @@ class AstronomicalRoutines:
                 self._sun_data,
                 ["next_rising_astro", "next_rising_nautical", "next_rising_civil"],
             )
-            or self._forecast_time > self._sun_data["next_setting_astro"]
-            or self._forecast_time > self._sun_data["next_setting_nautical"]
-            or self._forecast_time > self._sun_data["next_setting_civil"]
+            or self._forecast_time > self._sun_data.next_setting_astro
+            or self._forecast_time > self._sun_data.next_setting_nautical
+            or self._forecast_time > self._sun_data.next_setting_civil
         ):
             _LOGGER.debug("Astronomical calculations updating sun_next_setting")
             self._calculate_sun()
 
-        if self._sun_data.get("next_setting_astro", None) is not None:
-            return self._sun_data["next_setting_astro"]
-        if self._sun_data.get("next_setting_nautical", None) is not None:
-            return self._sun_data["next_setting_nautical"]
-        if self._sun_data.get("next_setting_civil", None) is not None:
-            return self._sun_data["next_setting_civil"]
+        if self._sun_data.next_setting_astro is not None:
+            return self._sun_data.next_setting_astro
+        if self._sun_data.next_setting_nautical is not None:
+            return self._sun_data.next_setting_nautical
+        if self._sun_data.next_setting_civil is not None:
+            return self._sun_data.next_setting_civil
 
     def _calculate_sun(self) -> None:
         """Calculates sun risings and settings."""
 
-        if self._sun_observer is None:
-            self._sun_observer = self._get_sun_observer(CIVIL_DUSK_DAWN)
-        if self._sun_observer_nautical is None:
-            self._sun_observer_nautical = self._get_sun_observer(NAUTICAL_DUSK_DAWN)
-        if self._sun_observer_astro is None:
-            self._sun_observer_astro = self._get_sun_observer(ASTRONOMICAL_DUSK_DAWN)
-        if self._sun is None:
-            self._sun = ephem.Sun()
+        if self._sun_calculated_for == self._forecast_time:
+            return
 
         self._calculate_sun_civil()
         self._calculate_sun_nautical()
         self._calculate_sun_astro()
         self._calculate_sun_altaz()
         self._calculate_sun_constellation()
+        self._sun_calculated_for = self._forecast_time
 
     def _calculate_sun_civil(self) -> None:
         # Rise and Setting (Civil)
-        try:
-            self._sun_data["next_rising_civil"] = (
-                self._sun_observer.next_rising(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the next rising
-            start = self._sun_observer.date.datetime()
-            end = self._sun_observer.date.datetime() + timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp < end:
-                timestamp += timedelta(minutes=1440)
-                self._sun_observer.date = timestamp
-                try:
-                    self._sun_data["next_rising_civil"] = (
-                        self._sun_observer.next_rising(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Sun next rising civil in {cnt} days.")
-                break
+        self._sun_observer.date = self._forecast_time
 
-        try:
-            self._sun_data["next_setting_civil"] = (
-                self._sun_observer.next_setting(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the next setting
-            start = self._sun_observer.date.datetime()
-            end = self._sun_observer.date.datetime() + timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp < end:
-                timestamp += timedelta(minutes=1440)
-                self._sun_observer.date = timestamp
-                try:
-                    self._sun_data["next_setting_civil"] = (
-                        self._sun_observer.next_setting(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Sun next setting civil in {cnt} days.")
-                break
+        next_rising = self._find_event(self._sun_observer, "next_rising", self._sun, use_center=True)
+        if next_rising is not None:
+            self._sun_data.next_rising_civil = next_rising
+
+        next_setting = self._find_event(self._sun_observer, "next_setting", self._sun, use_center=True)
+        if next_setting is not None:
+            self._sun_data.next_setting_civil = next_setting
 
     def _calculate_sun_nautical(self) -> None:
         # Rise and Setting (Nautical)
         self._sun_observer_nautical.date = self._forecast_time
-        self._sun.compute(self._sun_observer_nautical)
 
-        try:
-            self._sun_data["next_rising_nautical"] = (
-                self._sun_observer_nautical.next_rising(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the next astronomical rising
-            start = self._sun_observer_nautical.date.datetime()
-            end = self._sun_observer_nautical.date.datetime() + timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp < end:
-                timestamp += timedelta(minutes=1440)
-                self._sun_observer_nautical.date = timestamp
-                try:
-                    self._sun_data["next_rising_nautical"] = (
-                        self._sun_observer_nautical.next_rising(ephem.Sun(), use_center=True)
-                        .datetime()
-                        .replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Sun next rising nautical in {cnt} days.")
-                break
+        next_rising = self._find_event(self._sun_observer_nautical, "next_rising", self._sun, use_center=True)
+        if next_rising is not None:
+            self._sun_data.next_rising_nautical = next_rising
 
-        try:
-            self._sun_data["next_setting_nautical"] = (
-                self._sun_observer_nautical.next_setting(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the next astronomical setting
-            start = self._sun_observer_nautical.date.datetime()
-            end = self._sun_observer_nautical.date.datetime() + timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp < end:
-                timestamp += timedelta(minutes=1440)
-                self._sun_observer_nautical.date = timestamp
-                try:
-                    self._sun_data["next_setting_nautical"] = (
-                        self._sun_observer_nautical.next_setting(ephem.Sun(), use_center=True)
-                        .datetime()
-                        .replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Sun next setting nautical in {cnt} days.")
-                break
+        next_setting = self._find_event(self._sun_observer_nautical, "next_setting", self._sun, use_center=True)
+        if next_setting is not None:
+            self._sun_data.next_setting_nautical = next_setting
 
     def _calculate_sun_astro(self) -> None:
         # Rise and Setting (Astronomical)
         self._sun_observer_astro.date = self._forecast_time
-        self._sun.compute(self._sun_observer_astro)
 
-        try:
-            self._sun_data["next_rising_astro"] = (
-                self._sun_observer_astro.next_rising(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the next astronomical rising
-            start = self._sun_observer_astro.date.datetime()
-            end = self._sun_observer_astro.date.datetime() + timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp < end:
-                timestamp += timedelta(minutes=1440)
-                self._sun_observer_astro.date = timestamp
-                try:
-                    self._sun_data["next_rising_astro"] = (
-                        self._sun_observer_astro.next_rising(ephem.Sun(), use_center=True)
-                        .datetime()
-                        .replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Sun next rising astro in {cnt} days.")
-                break
+        next_rising = self._find_event(self._sun_observer_astro, "next_rising", self._sun, use_center=True)
+        if next_rising is not None:
+            self._sun_data.next_rising_astro = next_rising
 
-        try:
-            self._sun_data["previous_rising_astro"] = (
-                self._sun_observer_astro.previous_rising(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the previous astronomical rising
-            start = self._sun_observer_astro.date.datetime()
-            end = self._sun_observer_astro.date.datetime() - timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp > end:
-                timestamp -= timedelta(minutes=1440)
-                self._sun_observer_astro.date = timestamp
-                try:
-                    self._sun_data["previous_rising_astro"] = (
-                        self._sun_observer_astro.previous_rising(ephem.Sun(), use_center=True)
-                        .datetime()
-                        .replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Sun previous rising astro {cnt} days before.")
-                break
+        previous_rising = self._find_event(self._sun_observer_astro, "previous_rising", self._sun, use_center=True)
+        if previous_rising is not None:
+            self._sun_data.previous_rising_astro = previous_rising
 
-        try:
-            self._sun_data["next_setting_astro"] = (
-                self._sun_observer_astro.next_setting(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the next astronomical setting
-            start = self._sun_observer_astro.date.datetime()
-            end = self._sun_observer_astro.date.datetime() + timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp < end:
-                timestamp += timedelta(minutes=1440)
-                self._sun_observer_astro.date = timestamp
-                try:
-                    self._sun_data["next_setting_astro"] = (
-                        self._sun_observer_astro.next_setting(ephem.Sun(), use_center=True)
-                        .datetime()
-                        .replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Sun next setting astro in {cnt} days.")
-                break
+        next_setting = self._find_event(self._sun_observer_astro, "next_setting", self._sun, use_center=True)
+        if next_setting is not None:
+            self._sun_data.next_setting_astro = next_setting
 
-        try:
-            self._sun_data["previous_setting_astro"] = (
-                self._sun_observer_astro.previous_setting(ephem.Sun(), use_center=True).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the previous astronomical setting
-            start = self._sun_observer_astro.date.datetime()
-            end = self._sun_observer_astro.date.datetime() - timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp > end:
-                timestamp -= timedelta(minutes=1440)
-                self._sun_observer_astro.date = timestamp
-                try:
-                    self._sun_data["previous_setting_astro"] = (
-                        self._sun_observer_astro.previous_setting(ephem.Sun(), use_center=True)
-                        .datetime()
-                        .replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Sun previous setting astro {cnt} days before.")
-                break
+        previous_setting = self._find_event(self._sun_observer_astro, "previous_setting", self._sun, use_center=True)
+        if previous_setting is not None:
+            self._sun_data.previous_setting_astro = previous_setting
 
     def _calculate_sun_altaz(self) -> None:
         """Calculates sun altitude and azimuth."""
 
-        if self._sun_observer is None:
-            self._sun_observer = self._get_sun_observer(CIVIL_DUSK_DAWN)
-        if self._sun is None:
-            self._sun = ephem.Sun()
-
-        self._sun_observer.date = self._forecast_time
-        self._sun.compute(self._sun_observer)
+        self._compute_at_forecast_time(self._sun, self._sun_observer)
 
         # Sun Altitude
-        self._sun_data["altitude"] = deg(float(self._sun.alt))
+        self._sun_data.altitude = deg(float(self._sun.alt))
 
         # Sun Azimuth
-        self._sun_data["azimuth"] = deg(float(self._sun.az))
+        self._sun_data.azimuth = deg(float(self._sun.az))
 
     def _calculate_sun_constellation(self) -> None:
         """Calculates sun altitude and azimuth."""
 
-        if self._sun_observer is None:
-            self._sun_observer = self._get_sun_observer(CIVIL_DUSK_DAWN)
-        if self._sun is None:
-            self._sun = ephem.Sun()
-
-        self._sun_observer.date = self._forecast_time
-        self._sun.compute(self._sun_observer)
+        self._compute_at_forecast_time(self._sun, self._sun_observer)
 
         # Sun Constellation
         constellation = ephem.constellation(self._sun)[1]
-        self._sun_data["constellation"] = constellation
+        self._sun_data.constellation = constellation
 
     # #########################################################################
     # Moon
     # #########################################################################
     @typechecked
-    async def moon_data(self) -> MoonData:
+    def moon_data(self) -> MoonData:
         """Returns moon data."""
 
-        md = MoonDataModel(self._moon_data)
+        md = MoonDataModel(_state_to_model(self._moon_data))
         try:
             return MoonData(data=md)
         except TypeError as ve:
@@ -1060,106 +1191,27 @@ class AstronomicalRoutines:
     def _calculate_moon(self) -> None:
         """Calculates moon rising and setting."""
 
-        if self._moon_observer is None:
-            self._moon_observer = self._get_moon_observer()
-        if self._moon is None:
-            self._moon = ephem.Moon()
+        if self._moon_calculated_for == self._forecast_time:
+            return
 
         # Rise and Setting
         self._moon_observer.date = self._forecast_time
-        self._moon.compute(self._moon_observer)
 
-        try:
-            self._moon_data["next_rising"] = (
-                self._moon_observer.next_rising(ephem.Moon()).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the next astronomical rising
-            start = self._moon_observer.date.datetime()
-            end = self._moon_observer.date.datetime() + timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp < end:
-                timestamp += timedelta(minutes=1440)
-                self._moon_observer.date = timestamp
-                try:
-                    self._moon_data["next_rising"] = (
-                        self._moon_observer.next_rising(ephem.Moon()).datetime().replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Moon next rising in {cnt} days.")
-                break
+        next_rising = self._find_event(self._moon_observer, "next_rising", self._moon)
+        if next_rising is not None:
+            self._moon_data.next_rising = next_rising
 
-        try:
-            self._moon_data["next_setting"] = (
-                self._moon_observer.next_setting(ephem.Moon()).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the next astronomical setting
-            start = self._moon_observer.date.datetime()
-            end = self._moon_observer.date.datetime() + timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp < end:
-                timestamp += timedelta(minutes=1440)
-                self._moon_observer.date = timestamp
-                try:
-                    self._moon_data["next_setting"] = (
-                        self._moon_observer.next_setting(ephem.Moon()).datetime().replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Moon next setting in {cnt} days.")
-                break
+        next_setting = self._find_event(self._moon_observer, "next_setting", self._moon)
+        if next_setting is not None:
+            self._moon_data.next_setting = next_setting
 
-        try:
-            self._moon_data["previous_rising"] = (
-                self._moon_observer.previous_rising(ephem.Moon()).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the previous astronomical rising
-            start = self._moon_observer.date.datetime()
-            end = self._moon_observer.date.datetime() - timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp > end:
-                timestamp -= timedelta(minutes=1440)
-                self._moon_observer.date = timestamp
-                try:
-                    self._moon_data["previous_rising"] = (
-                        self._moon_observer.previous_rising(ephem.Moon()).datetime().replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Moon previous rising {cnt} days before.")
-                break
+        previous_rising = self._find_event(self._moon_observer, "previous_rising", self._moon)
+        if previous_rising is not None:
+            self._moon_data.previous_rising = previous_rising
 
-        try:
-            self._moon_data["previous_setting"] = (
-                self._moon_observer.previous_setting(ephem.Moon()).datetime().replace(tzinfo=UTC)
-            )
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            # Search for the previous astronomical setting
-            start = self._moon_observer.date.datetime()
-            end = self._moon_observer.date.datetime() - timedelta(days=365)
-            timestamp = start
-            cnt = 1
-            while timestamp > end:
-                timestamp -= timedelta(minutes=1440)
-                self._moon_observer.date = timestamp
-                try:
-                    self._moon_data["previous_setting"] = (
-                        self._moon_observer.previous_setting(ephem.Moon()).datetime().replace(tzinfo=UTC)
-                    )
-                except (ephem.AlwaysUpError, ephem.NeverUpError):
-                    cnt += 1
-                    continue
-                _LOGGER.debug(f"Moon previous setting {cnt} days before.")
-                break
+        previous_setting = self._find_event(self._moon_observer, "previous_setting", self._moon)
+        if previous_setting is not None:
+            self._moon_data.previous_setting = previous_setting
 
         # self._moon_observer.date = self._forecast_time + timedelta(days=1)
         # self._moon.compute(self._moon_observer)
@@ -1175,86 +1227,85 @@ class AstronomicalRoutines:
         #     pass
 
         # Next new Moon
-        self._moon_data["next_new_moon"] = ephem.next_new_moon(self._forecast_time).datetime().replace(tzinfo=UTC)
+        self._moon_data.next_new_moon = _to_utc(ephem.next_new_moon(self._forecast_time))
 
         # Next full Moon
-        self._moon_data["next_full_moon"] = ephem.next_full_moon(self._forecast_time).datetime().replace(tzinfo=UTC)
-
-        # Moon phase
-        self._moon_data["phase"] = self._moon.phase
+        self._moon_data.next_full_moon = _to_utc(ephem.next_full_moon(self._forecast_time))
 
+        # Recomputes the moon at the forecast time after the rise and setting search
         self._calculate_moon_altaz()
+
+        # Moon phase, the moon is computed for the forecast time by now
+        self._moon_data.phase = self._moon.phase
+
         self._calculate_moon_distance_size()
         self._calculate_moon_constellation()
+        self._moon_calculated_for = self._forecast_time
 
     def _calculate_moon_altaz(self) -> None:
         """Calculates moon altitude and azimuth."""
 
-        if self._moon_observer is None:
-            self._moon_observer = self._get_moon_observer()
-        if self._moon is None:
-            self._moon = ephem.Moon()
-
-        self._moon_observer.date = self._forecast_time
-        self._moon.compute(self._moon_observer)
+        self._compute_at_forecast_time(self._moon, self._moon_observer)
 
         # Moon Altitude
-        self._moon_data["altitude"] = deg(float(self._moon.alt))
+        self._moon_data.altitude = deg(float(self._moon.alt))
 
         # Moon Azimuth
-        self._moon_data["azimuth"] = deg(float(self._moon.az))
+        self._moon_data.azimuth = deg(float(self._moon.az))
 
     def _calculate_moon_distance_size(self) -> None:
         """Calculate moon distance and relative size"""
-        if self._moon_observer is None:
-            self._moon_observer = self._get_moon_observer()
-        if self._moon is None:
-            self._moon = ephem.Moon()
 
-        # Get the distance in Earth radii
-        self._moon_data["distance"] = self._moon.earth_distance  # in AU (Astronomical Units)
+        self._compute_at_forecast_time(self._moon, self._moon_observer)
 
-        # Convert to kilometers
-        self._moon_data["distance_km"] = self._moon_data["distance"] * 149597870.7  # 1 AU = 149597870.7 km
+        # Get the distance in Earth radii
+        distance = self._moon.earth_distance  # in AU (Astronomical Units)
+        distance_km = distance * AU_KM
 
         # Get the Moon's angular size (in degrees)
-        self._moon_data["angular_size"] = self._moon.radius * 2 * 57.29578  # 180 / pi
+        angular_size = self._moon.radius * 2 * RAD_TO_DEG
+
+        self._moon_data.distance = distance
+        self._moon_data.distance_km = distance_km
+        self._moon_data.angular_size = angular_size
 
         # Average distance and angular size for comparison
-        self._moon_data["avg_distance_km"] = 384400  # Average distance of the Moon from Earth in km
-        self._moon_data["avg_angular_size"] = 0.5181  # Average angular size in degrees
+        self._moon_data.avg_distance_km = MOON_AVG_DISTANCE_KM
+        self._moon_data.avg_angular_size = MOON_AVG_ANGULAR_SIZE
 
         # Relative distance and size compared to average
-        self._moon_data["relative_distance"] = self._moon_data["distance_km"] / self._moon_data["avg_distance_km"]
-        self._moon_data["relative_size"] = self._moon_data["angular_size"] / self._moon_data["avg_angular_size"]
+        self._moon_data.relative_distance = distance_km / MOON_AVG_DISTANCE_KM
+        self._moon_data.relative_size = angular_size / MOON_AVG_ANGULAR_SIZE
 
     def _calculate_moon_constellation(self) -> None:
         """Calculates sun altitude and azimuth."""
 
-        if self._moon_observer is None:
-            self._moon_observer = self._get_moon_observer()
-        if self._moon is None:
-            self._moon = ephem.Moon()
-
-        self._moon_observer.date = self._forecast_time
-        self._moon.compute(self._moon_observer)
+        self._compute_at_forecast_time(self._moon, self._moon_observer)
 
         # Moon Constellation
         constellation = ephem.constellation(self._moon)[1]
-        self._moon_data["constellation"] = constellation
+        self._moon_data.constellation = constellation
 
     # #########################################################################
     # Darkness
     # #########################################################################
     @typechecked
-    async def darkness_data(self) -> DarknessData:
+    def darkness_data(self) -> DarknessData:
         """Returns darkness data."""
 
-        self._darkness_data["deep_sky_darkness_moon_rises"] = self._deep_sky_darkness_moon_rises()
-        self._darkness_data["deep_sky_darkness_moon_sets"] = self._deep_sky_darkness_moon_sets()
-        self._darkness_data["deep_sky_darkness_moon_always_up"] = self._deep_sky_darkness_moon_always_up()
-        self._darkness_data["deep_sky_darkness_moon_always_down"] = self._deep_sky_darkness_moon_always_down()
-        self._darkness_data["deep_sky_darkness"] = self._deep_sky_darkness()
+        in_dark = self._astronomical_darkness()
+        start_timestamp = self._astronomical_night_start(in_dark)
+        moon_during_darkness = self._classify_moon_during_darkness(start_timestamp, in_dark)
+
+        (
+            self._darkness_data["deep_sky_darkness_moon_rises"],
+            self._darkness_data["deep_sky_darkness_moon_sets"],
+            self._darkness_data["deep_sky_darkness_moon_always_up"],
+            self._darkness_data["deep_sky_darkness_moon_always_down"],
+        ) = moon_during_darkness
+        self._darkness_data["deep_sky_darkness"] = self._deep_sky_darkness(
+            start_timestamp, in_dark, moon_during_darkness
+        )
 
         dd = DarknessDataModel(self._darkness_data)
         try:
@@ -1264,155 +1315,125 @@ class AstronomicalRoutines:
             _LOGGER.error(ve)
             return None
 
-    async def night_duration_astronomical(self) -> float:
+    def night_duration_astronomical(self) -> float:
         """Returns the remaining timespan of astronomical darkness."""
 
-        start_timestamp = None
-
-        # Are we already in darkness?
-        if self._astronomical_darkness():
-            start_timestamp = self._sun_data["previous_setting_astro"]
-        else:
-            start_timestamp = self._sun_data["next_setting_astro"]
+        start_timestamp = self._astronomical_night_start(self._astronomical_darkness())
 
-        return (self._sun_data["next_rising_astro"] - start_timestamp).total_seconds()
+        return (self._sun_data.next_rising_astro - start_timestamp).total_seconds()
 
-    def _deep_sky_darkness(self) -> float:
+    def _deep_sky_darkness(self, start_timestamp=None, in_dark=None, moon_during_darkness=None) -> float:
         """Returns the remaining timespan of deep sky darkness."""
 
+        if in_dark is None:
+            in_dark = self._astronomical_darkness()
+        if start_timestamp is None:
+            start_timestamp = self._astronomical_night_start(in_dark)
+        if moon_during_darkness is None:
+            moon_during_darkness = self._classify_moon_during_darkness(start_timestamp, in_dark)
+        moon_rises, moon_sets, moon_always_up, moon_always_down = moon_during_darkness
+
+        # A moon up during the whole night leaves no deep sky darkness at all
+        if moon_always_up:
+            _LOGGER.debug("DSD: Moon always up 0:00:00")
+            return 0.0
+        _LOGGER.debug("DSD: Moon NOT always up")
+
         dsd = timedelta(0)
 
-        if self._astronomical_darkness():
+        if in_dark:
             _LOGGER.debug("DSD: In astronomical darkness")
-            if self._deep_sky_darkness_moon_rises():
-                dsd = self._moon_data["next_rising"] - self._forecast_time
-                _LOGGER.debug(f"DSD: Sun down, Moon rises {dsd}")
+            if moon_rises:
+                dsd = self._moon_data.next_rising - self._forecast_time
+                _LOGGER.debug("DSD: Sun down, Moon rises %s", dsd)
 
-            if self._deep_sky_darkness_moon_sets():
+            if moon_sets:
                 if self._moon_down():
-                    dsd = self._sun_data["next_rising_astro"] - self._forecast_time
-                    _LOGGER.debug(f"DSD: Sun down, Moon is down {dsd}")
+                    dsd = self._sun_data.next_rising_astro - self._forecast_time
+                    _LOGGER.debug("DSD: Sun down, Moon is down %s", dsd)
                 else:
-                    dsd = self._sun_data["next_rising_astro"] - self._moon_data["next_setting"]
-                    _LOGGER.debug(f"DSD: Sun down, Moon sets {dsd}")
+                    dsd = self._sun_data.next_rising_astro - self._moon_data.next_setting
+                    _LOGGER.debug("DSD: Sun down, Moon sets %s", dsd)
 
-            if self._deep_sky_darkness_moon_always_down():
-                dsd = self._sun_data["next_rising_astro"] - self._forecast_time
-                _LOGGER.debug(f"DSD: Moon always down {dsd}")
+            if moon_always_down:
+                dsd = self._sun_data.next_rising_astro - self._forecast_time
+                _LOGGER.debug("DSD: Moon always down %s", dsd)
             else:
-                _LOGGER.debug(f"DSD: Moon NOT always down {dsd}")
+                _LOGGER.debug("DSD: Moon NOT always down %s", dsd)
 
-        if not self._astronomical_darkness():
+        if not in_dark:
             _LOGGER.debug("DSD: At sunlight")
-            if self._deep_sky_darkness_moon_rises():
-                dsd = self._moon_data["next_rising"] - self._sun_data["next_setting_astro"]
-                _LOGGER.debug(f"DSD: Sun up, Moon rises {dsd}")
+            if moon_rises:
+                dsd = self._moon_data.next_rising - self._sun_data.next_setting_astro
+                _LOGGER.debug("DSD: Sun up, Moon rises %s", dsd)
 
-            if self._deep_sky_darkness_moon_sets():
-                dsd = self._sun_data["next_rising_astro"] - self._moon_data["next_setting"]
-                _LOGGER.debug(f"DSD: Sun up, Moon sets {dsd}")
+            if moon_sets:
+                dsd = self._sun_data.next_rising_astro - self._moon_data.next_setting
+                _LOGGER.debug("DSD: Sun up, Moon sets %s", dsd)
 
-            if self._deep_sky_darkness_moon_always_down():
-                dsd = self._sun_data["next_rising_astro"] - self._sun_data["next_setting_astro"]
-                _LOGGER.debug(f"DSD: Sun up, Moon down {dsd}")
-
-        if self._deep_sky_darkness_moon_always_up():
-            dsd = timedelta(0)
-            _LOGGER.debug(f"DSD: Moon always up {dsd}")
-        else:
-            _LOGGER.debug(f"DSD: Moon NOT always up {dsd}")
+            if moon_always_down:
+                dsd = self._sun_data.next_rising_astro - self._sun_data.next_setting_astro
+                _LOGGER.debug("DSD: Sun up, Moon down %s", dsd)
 
         return dsd.total_seconds()
 
     def _astronomical_darkness(self) -> bool:
         """Returns true during astronomical night."""
 
-        if self._sun_data["next_setting_astro"] > self._sun_data["next_rising_astro"]:
-            return True
-        return False
-
-    def _moon_down(self) -> bool:
-        """Returns true while moon is set-"""
+        cache = self._astronomical_darkness_cache
+        if cache is None or cache[0] != self._sun_calculated_for:
+            in_dark = self._sun_data.next_setting_astro > self._sun_data.next_rising_astro
+            self._astronomical_darkness_cache = (self._sun_calculated_for, in_dark)
+        return self._astronomical_darkness_cache[1]
 
-        if self._moon_data["next_setting"] > self._moon_data["next_rising"]:
-            return True
-        return False
-
-    def _deep_sky_darkness_moon_rises(self) -> bool:
-        """Returns true if moon rises during astronomical night."""
-
-        start_timestamp = None
+    def _astronomical_night_start(self, in_dark) -> datetime:
+        """Returns the start of the current or the next astronomical night."""
 
         # Are we already in darkness?
-        if self._astronomical_darkness():
-            start_timestamp = self._sun_data["previous_setting_astro"]
-        else:
-            start_timestamp = self._sun_data["next_setting_astro"]
+        if in_dark:
+            return self._sun_data.previous_setting_astro
+        return self._sun_data.next_setting_astro
 
-        if (
-            self._moon_data["next_rising"] > start_timestamp
-            and self._moon_data["next_rising"] < self._sun_data["next_rising_astro"]
-        ):
-            _LOGGER.debug("DSD: Moon rises during astronomical night")
-            return True
-        return False
+    def _moon_down(self) -> bool:
+        """Returns true while moon is set-"""
 
-    def _deep_sky_darkness_moon_sets(self) -> bool:
-        """Returns true if moon sets during astronomical night."""
+        cache = self._moon_down_cache
+        if cache is None or cache[0] != self._moon_calculated_for:
+            moon_down = self._moon_data.next_setting > self._moon_data.next_rising
+            self._moon_down_cache = (self._moon_calculated_for, moon_down)
+        return self._moon_down_cache[1]
 
-        start_timestamp = None
+    def _classify_moon_during_darkness(self, start_timestamp=None, in_dark=None) -> tuple[bool, bool, bool, bool]:
+        """Returns whether the moon rises, sets, is always up or always down during astronomical night."""
 
-        # Are we already in darkness?
-        if self._astronomical_darkness():
-            start_timestamp = self._sun_data["previous_setting_astro"]
-        else:
-            start_timestamp = self._sun_data["next_setting_astro"]
+        if in_dark is None:
+            in_dark = self._astronomical_darkness()
+        if start_timestamp is None:
+            start_timestamp = self._astronomical_night_start(in_dark)
+
+        end_timestamp = self._sun_data.next_rising_astro
+        next_rising = self._moon_data.next_rising
+        next_setting = self._moon_data.next_setting
+        previous_setting = self._moon_data.previous_setting
 
         # Did Moon already set in darkness?
-        if self._moon_down() and self._astronomical_darkness():
-            start_timestamp_moon = self._moon_data["previous_setting"]
+        if in_dark and self._moon_down():
+            start_timestamp_moon = previous_setting
         else:
-            start_timestamp_moon = self._moon_data["next_setting"]
-
-        if start_timestamp_moon > start_timestamp and start_timestamp_moon < self._sun_data["next_rising_astro"]:
-            _LOGGER.debug("DSD: Moon sets during astronomical night")
-            return True
-        return False
+            start_timestamp_moon = next_setting
 
-    def _deep_sky_darkness_moon_always_up(self) -> bool:
-        """Returns true if moon is up during astronomical night."""
+        moon_rises = start_timestamp < next_rising < end_timestamp
+        moon_sets = start_timestamp < start_timestamp_moon < end_timestamp
+        moon_always_up = next_rising < start_timestamp and next_setting > end_timestamp
+        moon_always_down = previous_setting < start_timestamp and next_rising > end_timestamp
 
-        start_timestamp = None
-
-        # Are we already in darkness?
-        if self._astronomical_darkness():
-            start_timestamp = self._sun_data["previous_setting_astro"]
-        else:
-            start_timestamp = self._sun_data["next_setting_astro"]
-
-        if (
-            self._moon_data["next_rising"] < start_timestamp
-            and self._moon_data["next_setting"] > self._sun_data["next_rising_astro"]
-        ):
+        if moon_rises:
+            _LOGGER.debug("DSD: Moon rises during astronomical night")
+        if moon_sets:
+            _LOGGER.debug("DSD: Moon sets during astronomical night")
+        if moon_always_up:
             _LOGGER.debug("DSD: Moon is up during astronomical night")
-            return True
-        return False
-
-    def _deep_sky_darkness_moon_always_down(self) -> bool:
-        """Returns true if moon is down during astronomical night."""
-
-        start_timestamp = None
-
-        # Are we already in darkness?
-        if self._astronomical_darkness():
-            start_timestamp = self._sun_data["previous_setting_astro"]
-        else:
-            start_timestamp = self._sun_data["next_setting_astro"]
-
-        if (
-            self._moon_data["previous_setting"] < start_timestamp
-            and self._moon_data["next_rising"] > self._sun_data["next_rising_astro"]
-        ):
+        if moon_always_down:
             _LOGGER.debug("DSD: Moon is down during astronomical night")
-            return True
-        return False
+
+        return moon_rises, moon_sets, moon_always_up, moon_always_down
@@ -2,28 +2,217 @@
 """The test for the API"""
 
 import asyncio
+import functools
+import json
 import logging
+import operator
 import os
+import shelve
+import sys
 import time
-from datetime import datetime
+from datetime import UTC, datetime
 from tabulate import tabulate
 
-import pytz
+from aiohttp import ClientSession, TCPConnector
 
 from pyastroweatherio import (
     AstroWeather,
     AstroWeatherError,
 )
+from test_common import COLOR_BLUE, COLOR_GREEN, COLOR_RED, COLOR_RESET, backyard_location, setup_logging, use_uvloop
 
 _LOGGER = logging.getLogger(__name__)
 
-COLOR_BLACK = "1;30"
-COLOR_RED = "1;31"
-COLOR_GREEN = "1;32"
-COLOR_BROWN = "1;33"
-COLOR_BLUE = "1;34"
-COLOR_PURPLE = "1;35"
-COLOR_CYAN = "1;36"
+SEPARATOR = f"{COLOR_BLUE}{'-' * 119}{COLOR_RESET}"
+
+# Format of the timestamp columns
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+# Headers of the tables
+HOURLY_HEADERS = (
+    "forecast_time",
+    "cloudcover",
+    "cloudless",
+    "clouds",
+    "high",
+    "medium",
+    "low",
+    "fog",
+    "fog2m",
+    "precipitation",
+    "wind_direction",
+    "wind_speed",
+    "calm",
+    "temp2m",
+    "rh2m",
+    "dewpoint2m",
+    "condition",
+    "seeing",
+    "transparency",
+    "lifted_index",
+    "weather",
+    "weather6",
+)
+DEEPSKY_HEADERS = (
+    "hour",
+    "nightly_conditions",
+    "weather",
+    "precipitation_amount6",
+)
+LOCATION_HEADERS = (
+    "forecast_time",
+    "forecast_length",
+    "time_shift",
+    "latitude",
+    "longitude",
+    "elevation",
+)
+CLOUDS_HEADERS = (
+    "condition",
+    "condition_plain",
+    "cloudcover",
+    "cloudless",
+    "clouds",
+    "high",
+    "medium",
+    "low",
+    "fog",
+    "fog2m",
+)
+ATMOSPHERE_HEADERS = (
+    "seeing",
+    "transparency",
+    "lifted_index",
+    "lifted_index_plain",
+    "wind",
+    "temp",
+    "rh",
+    "dewpoint",
+    "weather",
+)
+NIGHT_HEADERS = (
+    "view",
+    "1",
+    "1_dayname",
+    "1_desc",
+    "1_plain",
+    "2",
+    "2_dayname",
+    "2_desc",
+    "2_plain",
+    "moon_rises",
+    "moon_sets",
+    "moon_down",
+    "moon_up",
+    "duration",
+    "darkness",
+)
+SUN_HEADERS = (
+    "altitude",
+    "azimuth",
+    "next_rising",
+    "next_rising_nautical",
+    "next_rising_astro",
+    "next_setting",
+    "next_setting_nautical",
+    "next_setting_astro",
+    "constellation",
+)
+MOON_HEADERS = (
+    "altitude",
+    "azimuth",
+    "phase",
+    "next_rising",
+    "next_setting",
+    "next_new_moon",
+    "next_full_moon",
+    "distance_km",
+    "angular_size",
+    "relative_distance",
+    "relative_size",
+    "constellation",
+)
+UPTONIGHT_HEADERS = (
+    "dsos",
+    "name",
+    "bodies",
+    "name",
+    "comets",
+    "designation",
+)
+
+# Rows of the tables with plain attribute columns, in the order of their headers
+HOURLY_ROW = operator.attrgetter(
+    "forecast_time",
+    "cloudcover_percentage",
+    "cloudless_percentage",
+    "cloud_area_fraction_percentage",
+    "cloud_area_fraction_high_percentage",
+    "cloud_area_fraction_medium_percentage",
+    "cloud_area_fraction_low_percentage",
+    "fog_area_fraction_percentage",
+    "fog2m_area_fraction_percentage",
+    "precipitation_amount",
+    "wind10m_direction",
+    "wind10m_speed",
+    "calm_percentage",
+    "temp2m",
+    "rh2m",
+    "dewpoint2m",
+    "condition_percentage",
+    "seeing_percentage",
+    "transparency_percentage",
+    "lifted_index",
+    "weather",
+    "weather6",
+)
+DEEPSKY_ROW = operator.attrgetter(
+    "hour",
+    "nightly_conditions",
+    "weather",
+    "precipitation_amount6",
+)
+CLOUDS_ROW = operator.attrgetter(
+    "condition_percentage",
+    "condition_plain",
+    "cloudcover_percentage",
+    "cloudless_percentage",
+    "cloud_area_fraction_percentage",
+    "cloud_area_fraction_high_percentage",
+    "cloud_area_fraction_medium_percentage",
+    "cloud_area_fraction_low_percentage",
+    "fog_area_fraction_percentage",
+    "fog2m_area_fraction_percentage",
+)
+
+# Options of the client, the same for every location
+ASTROWEATHER_OPTIONS = {
+    "cloudcover_weight": 3,
+    "cloudcover_high_weakening": 0.5,
+    "cloudcover_medium_weakening": 0.75,
+    "cloudcover_low_weakening": 0.75,
+    "fog_weight": 3,
+    "seeing_weight": 2,
+    "transparency_weight": 1,
+    "calm_weight": 2,
+    "uptonight_path": ".",
+    # "test_datetime": datetime.strptime("2024-11-19T07:00:00Z", "%Y-%m-%dT%H:%M:%SZ"),
+    "experimental_features": True,
+    "forecast_model": "icon_seamless",
+}
+
+# Set AW_CACHE=1 to reuse the results of the library across runs within an hour, e.g. for repeated
+# benchmark runs. The cache holds the processed forecasts, so leave it off when changing the library.
+CACHE = os.environ.get("AW_CACHE", "0") == "1"
+CACHE_PATH = ".aw_cache"
+CACHE_TTL = 3600
+
+# Forecast hours to request and rows to print per table, smaller values keep benchmark runs short
+HOURS = int(os.environ.get("AW_HOURS", 72))
+LIMIT = int(os.environ.get("AW_LIMIT", 9999))
+
+# Write all results as a single JSON document instead of the tables
+JSON_OUTPUT = "--json" in sys.argv
 
 # # ITV
 # latitude = 50.429
@@ -37,416 +226,248 @@ COLOR_CYAN = "1;36"
 # elevation = 977
 # timezone_info = "Europe/Berlin"
 
-LOCATIONS = [
-    {
+
+def locations():
+    """Returns the locations to run the example for, further ones are test_common.Location tuples"""
+    return (
         # Backyard
-        "latitude": float(os.environ["BACKYARD_LATITUDE"]),
-        "longitude": float(os.environ["BACKYARD_LONGITUDE"]),
-        "elevation": int(os.environ["BACKYARD_ELEVATION"]),
-        "timezone_info": os.environ["BACKYARD_TIMEZONE"],
-    },
-    # {
-    #     # Santiago
-    #     "latitude": -33.46,
-    #     "longitude": -70.65,
-    #     "elevation": 556,
-    #     "timezone_info": "America/Santiago",
-    # },
-    # {
-    #     # Anchorage
-    #     "latitude": 61.212,
-    #     "longitude": -149.737,
-    #     "elevation": 115,
-    #     "timezone_info": "America/Anchorage",
-    # },
-    # {
-    #     # Hacienda Los Andes
-    #     "latitude": -30.29528,
-    #     "longitude": -70.71262,
-    #     "elevation": 1000,
-    #     "timezone_info": "Chile/Continental",
-    # },
-    # {
-    #     # London
-    #     "latitude": 51.5072,
-    #     "longitude": 0.1276,
-    #     "elevation": 11,
-    #     "timezone_info": "Europe/London",
-    # },
-    # {
-    #     # Sydney
-    #     "latitude": -33.869,
-    #     "longitude": 151.198,
-    #     "elevation": 3,
-    #     "timezone_info": "Australia/Sydney",
-    # },
-    # {
-    #     # Helsinki
-    #     "latitude": 65.064717,
-    #     "longitude": 25.553043,
-    #     "elevation": 12,
-    #     "timezone_info": "Europe/Helsinki",
-    # },
-]
-
-
-def esc(code):
-    return f"\033[{code}m"
-
-
-def utc_to_local(utc_dt):
-    """Localizes the datetime"""
-    local_tz = pytz.timezone(timezone_info)
-    local_dt = utc_dt.replace(tzinfo=pytz.utc).astimezone(local_tz)
-    return local_tz.normalize(local_dt)
-
-
-def convert_to_hhmm(sec):
-    sec = sec % (24 * 3600)
-    hour = sec // 3600
-    sec %= 3600
-    min = sec // 60
-    sec %= 60
-
-    return "%02d:%02d" % (hour, min)
-
-
-async def main() -> None:
-    """Create the aiohttp session and run the example."""
-    logging.basicConfig(level=logging.DEBUG)
-
-    print(
-        f"{esc(COLOR_BLUE)}--------------------------------------------------------"
-        + f"---------------------------------------------------------------{esc('0')}"
-    )
-    print(f"{esc(COLOR_RED)}Date & Time: {esc(COLOR_GREEN)}{str(datetime.now())}, ")
-    print(
-        f"{esc(COLOR_BLUE)}--------------------------------------------------------"
-        + f"---------------------------------------------------------------{esc('0')}"
+        backyard_location(),
+        # Location(-33.46, -70.65, 556, "America/Santiago"),  # Santiago
+        # Location(61.212, -149.737, 115, "America/Anchorage"),  # Anchorage
+        # Location(-30.29528, -70.71262, 1000, "Chile/Continental"),  # Hacienda Los Andes
+        # Location(51.5072, 0.1276, 11, "Europe/London"),  # London
+        # Location(-33.869, 151.198, 3, "Australia/Sydney"),  # Sydney
+        # Location(65.064717, 25.553043, 12, "Europe/Helsinki"),  # Helsinki
     )
 
+
+async def cached(location, endpoint, coro_factory, ttl=CACHE_TTL):
+    """Returns the cached result of the endpoint for the location and hour or requests it"""
+    if not CACHE:
+        return await coro_factory()
+    key = f"{endpoint}:{location.latitude}:{location.longitude}:{location.elevation}:{datetime.now(UTC):%Y%m%d%H}"
+    with shelve.open(CACHE_PATH) as cache:
+        entry = cache.get(key)
+    if entry is not None and entry[0] > time.time():
+        return entry[1]
+
+    value = await coro_factory()
+    with shelve.open(CACHE_PATH) as cache:
+        cache[key] = (time.time() + ttl, value)
+    return value
+
+
+def to_json(obj):
+    """Serializes the result objects by their attributes and everything else as string"""
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    return str(obj)
+
+
+def print_banner():
+    """Writes the current date and time between two separators"""
+    date_line = f"{COLOR_RED}Date & Time: {COLOR_GREEN}{datetime.now().isoformat(sep=' ')}, \n"
+    sys.stdout.writelines((SEPARATOR, "\n", date_line, SEPARATOR, "\n"))
+
+
+def print_table(rows, headers):
+    """Writes a table in the table color, followed by an empty line"""
+    sys.stdout.writelines((COLOR_BLUE, tabulate(rows, headers=headers), COLOR_RESET, "\n\n"))
+
+
+async def main(location) -> None:
+    """Create the aiohttp session and run the example for the location."""
+    setup_logging(_LOGGER)
+
+    if not JSON_OUTPUT:
+        print_banner()
+
+    # One session for all requests, so connections and DNS lookups for the APIs are reused
+    session = ClientSession(
+        connector=TCPConnector(
+            limit=0,
+            limit_per_host=8,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+        )
+    )
     astroweather = AstroWeather(
-        latitude=latitude,
-        longitude=longitude,
-        elevation=elevation,
-        timezone_info=timezone_info,
-        cloudcover_weight=3,
-        cloudcover_high_weakening=0.5,
-        cloudcover_medium_weakening=0.75,
-        cloudcover_low_weakening=0.75,
-        fog_weight=3,
-        seeing_weight=2,
-        transparency_weight=1,
-        calm_weight=2,
-        uptonight_path=".",
-        # test_datetime=datetime.strptime("2024-11-19T07:00:00Z", "%Y-%m-%dT%H:%M:%SZ"),
-        experimental_features=True,
-        forecast_model="icon_seamless",
+        session=session,
+        **location._asdict(),
+        **ASTROWEATHER_OPTIONS,
     )
 
-    start = time.time()
+    start = time.perf_counter()
 
     test_hourly_forecast = True
     test_deepsky_forecast = True
     test_location_data = True
-    try:
-        if test_hourly_forecast:
-            data = await astroweather.get_hourly_forecast()
-
-            headers = [
-                "forecast_time",
-                "cloudcover",
-                "cloudless",
-                "clouds",
-                "high",
-                "medium",
-                "low",
-                "fog",
-                "fog2m",
-                "precipitation",
-                "wind_direction",
-                "wind_speed",
-                "calm",
-                "temp2m",
-                "rh2m",
-                "dewpoint2m",
-                "condition",
-                "seeing",
-                "transparency",
-                "lifted_index",
-                "weather",
-                "weather6",
-            ]
-            rows = [
-                [
-                    obj.forecast_time,
-                    obj.cloudcover_percentage,
-                    obj.cloudless_percentage,
-                    obj.cloud_area_fraction_percentage,
-                    obj.cloud_area_fraction_high_percentage,
-                    obj.cloud_area_fraction_medium_percentage,
-                    obj.cloud_area_fraction_low_percentage,
-                    obj.fog_area_fraction_percentage,
-                    obj.fog2m_area_fraction_percentage,
-                    obj.precipitation_amount,
-                    obj.wind10m_direction,
-                    obj.wind10m_speed,
-                    obj.calm_percentage,
-                    obj.temp2m,
-                    obj.rh2m,
-                    obj.dewpoint2m,
-                    obj.condition_percentage,
-                    obj.seeing_percentage,
-                    obj.transparency_percentage,
-                    obj.lifted_index,
-                    obj.weather,
-                    obj.weather6,
+    async with session:
+        try:
+            # The forecasts are independent of each other, so they are fetched concurrently
+            hourly_data, deepsky_data, location_data = await asyncio.gather(
+                (
+                    cached(location, f"hourly:{HOURS}", functools.partial(astroweather.get_hourly_forecast, HOURS))
+                    if test_hourly_forecast
+                    else asyncio.sleep(0)
+                ),
+                (
+                    cached(location, "deepsky", astroweather.get_deepsky_forecast)
+                    if test_deepsky_forecast
+                    else asyncio.sleep(0)
+                ),
+                (
+                    cached(location, "location", astroweather.get_location_data)
+                    if test_location_data
+                    else asyncio.sleep(0)
+                ),
+            )
+
+            if JSON_OUTPUT:
+                results = {"hourly": hourly_data, "deepsky": deepsky_data, "location": location_data}
+                sys.stdout.write(json.dumps(results, default=to_json) + "\n")
+
+            if test_hourly_forecast and not JSON_OUTPUT:
+                data = hourly_data[:LIMIT]
+
+                rows = list(map(HOURLY_ROW, data))
+                print_table(rows, HOURLY_HEADERS)
+
+            if test_deepsky_forecast and not JSON_OUTPUT:
+                data = deepsky_data[:LIMIT]
+
+                rows = list(map(DEEPSKY_ROW, data))
+                print_table(rows, DEEPSKY_HEADERS)
+
+            if test_location_data and not JSON_OUTPUT:
+                data = location_data[:LIMIT]
+
+                print("Location:")
+                rows = [
+                    [
+                        obj.forecast_time.strftime(TIME_FORMAT),
+                        obj.forecast_length,
+                        obj.time_shift,
+                        obj.latitude,
+                        obj.longitude,
+                        obj.elevation,
+                    ]
+                    for obj in data
                 ]
-                for obj in data
-            ]
-            print(f"{esc(COLOR_BLUE)}" + f"{tabulate(rows, headers=headers)}" + f"{esc('0')}\n")
-
-        if test_deepsky_forecast:
-            data = await astroweather.get_deepsky_forecast()
-
-            headers = [
-                "hour",
-                "nightly_conditions",
-                "weather",
-                "precipitation_amount6",
-            ]
-            rows = [
-                [
-                    obj.hour,
-                    obj.nightly_conditions,
-                    obj.weather,
-                    obj.precipitation_amount6,
+                print_table(rows, LOCATION_HEADERS)
+
+                print("Clouds:")
+                rows = list(map(CLOUDS_ROW, data))
+                print_table(rows, CLOUDS_HEADERS)
+
+                print("Atmosphere:")
+                rows = [
+                    [
+                        (obj.seeing, obj.seeing_percentage),
+                        (obj.transparency, obj.transparency_percentage),
+                        obj.lifted_index,
+                        obj.lifted_index_plain,
+                        (obj.wind10m_speed_plain, obj.wind10m_direction, obj.wind10m_speed),
+                        obj.temp2m,
+                        obj.rh2m,
+                        obj.dewpoint2m,
+                        obj.weather,
+                    ]
+                    for obj in data
                 ]
-                for obj in data
-            ]
-            print(f"{esc(COLOR_BLUE)}" + f"{tabulate(rows, headers=headers)}" + f"{esc('0')}\n")
-
-        if test_location_data:
-            data = await astroweather.get_location_data()
-
-            print("Location:")
-            headers = [
-                "forecast_time",
-                "forecast_length",
-                "time_shift",
-                "latitude",
-                "longitude",
-                "elevation",
-            ]
-            rows = [
-                [
-                    obj.forecast_time.strftime("%Y-%m-%d %H:%M"),
-                    obj.forecast_length,
-                    obj.time_shift,
-                    obj.latitude,
-                    obj.longitude,
-                    obj.elevation,
+                print_table(rows, ATMOSPHERE_HEADERS)
+
+                print("During the night:")
+                rows = [
+                    [
+                        obj.deep_sky_view,
+                        obj.deepsky_forecast_today,
+                        obj.deepsky_forecast_today_dayname,
+                        obj.deepsky_forecast_today_desc,
+                        obj.deepsky_forecast_today_plain,
+                        obj.deepsky_forecast_tomorrow,
+                        obj.deepsky_forecast_tomorrow_dayname,
+                        obj.deepsky_forecast_tomorrow_desc,
+                        obj.deepsky_forecast_tomorrow_plain,
+                        obj.deep_sky_darkness_moon_rises,
+                        obj.deep_sky_darkness_moon_sets,
+                        obj.deep_sky_darkness_moon_always_down,
+                        obj.deep_sky_darkness_moon_always_up,
+                        round(obj.night_duration_astronomical / 3600, 2),
+                        round(obj.deep_sky_darkness / 3600, 2),
+                    ]
+                    for obj in data
                 ]
-                for obj in data
-            ]
-            print(f"{esc(COLOR_BLUE)}" + f"{tabulate(rows, headers=headers)}" + f"{esc('0')}\n")
-
-            print("Clouds:")
-            headers = [
-                "condition",
-                "condition_plain",
-                "cloudcover",
-                "cloudless",
-                "clouds",
-                "high",
-                "medium",
-                "low",
-                "fog",
-                "fog2m",
-            ]
-            rows = [
-                [
-                    obj.condition_percentage,
-                    obj.condition_plain,
-                    obj.cloudcover_percentage,
-                    obj.cloudless_percentage,
-                    obj.cloud_area_fraction_percentage,
-                    obj.cloud_area_fraction_high_percentage,
-                    obj.cloud_area_fraction_medium_percentage,
-                    obj.cloud_area_fraction_low_percentage,
-                    obj.fog_area_fraction_percentage,
-                    obj.fog2m_area_fraction_percentage,
+                print_table(rows, NIGHT_HEADERS)
+
+                print("Sun:")
+                rows = [
+                    [
+                        obj.sun_altitude,
+                        obj.sun_azimuth,
+                        obj.sun_next_rising.strftime(TIME_FORMAT),
+                        obj.sun_next_rising_nautical.strftime(TIME_FORMAT),
+                        obj.sun_next_rising_astro.strftime(TIME_FORMAT),
+                        obj.sun_next_setting.strftime(TIME_FORMAT),
+                        obj.sun_next_setting_nautical.strftime(TIME_FORMAT),
+                        obj.sun_next_setting_astro.strftime(TIME_FORMAT),
+                        obj.sun_constellation,
+                    ]
+                    for obj in data
                 ]
-                for obj in data
-            ]
-            print(f"{esc(COLOR_BLUE)}" + f"{tabulate(rows, headers=headers)}" + f"{esc('0')}\n")
-
-            print("Atmosphere:")
-            headers = [
-                "seeing",
-                "transparency",
-                "lifted_index",
-                "lifted_index_plain",
-                "wind",
-                "temp",
-                "rh",
-                "dewpoint",
-                "weather",
-            ]
-            rows = [
-                [
-                    (obj.seeing, obj.seeing_percentage),
-                    (obj.transparency, obj.transparency_percentage),
-                    obj.lifted_index,
-                    obj.lifted_index_plain,
-                    (obj.wind10m_speed_plain, obj.wind10m_direction, obj.wind10m_speed),
-                    obj.temp2m,
-                    obj.rh2m,
-                    obj.dewpoint2m,
-                    obj.weather,
+                print_table(rows, SUN_HEADERS)
+
+                print("Moon:")
+                rows = [
+                    [
+                        obj.moon_altitude,
+                        obj.moon_azimuth,
+                        obj.moon_phase,
+                        obj.moon_next_rising.strftime(TIME_FORMAT),
+                        obj.moon_next_setting.strftime(TIME_FORMAT),
+                        obj.moon_next_new_moon.strftime(TIME_FORMAT),
+                        obj.moon_next_full_moon.strftime(TIME_FORMAT),
+                        obj.moon_distance_km,
+                        obj.moon_angular_size,
+                        obj.moon_relative_distance,
+                        obj.moon_relative_size,
+                        obj.moon_constellation,
+                    ]
+                    for obj in data
                 ]
-                for obj in data
-            ]
-            print(f"{esc(COLOR_BLUE)}" + f"{tabulate(rows, headers=headers)}" + f"{esc('0')}\n")
-
-            print("During the night:")
-            headers = [
-                "view",
-                "1",
-                "1_dayname",
-                "1_desc",
-                "1_plain",
-                "2",
-                "2_dayname",
-                "2_desc",
-                "2_plain",
-                "moon_rises",
-                "moon_sets",
-                "moon_down",
-                "moon_up",
-                "duration",
-                "darkness",
-            ]
-            rows = [
-                [
-                    obj.deep_sky_view,
-                    obj.deepsky_forecast_today,
-                    obj.deepsky_forecast_today_dayname,
-                    obj.deepsky_forecast_today_desc,
-                    obj.deepsky_forecast_today_plain,
-                    obj.deepsky_forecast_tomorrow,
-                    obj.deepsky_forecast_tomorrow_dayname,
-                    obj.deepsky_forecast_tomorrow_desc,
-                    obj.deepsky_forecast_tomorrow_plain,
-                    obj.deep_sky_darkness_moon_rises,
-                    obj.deep_sky_darkness_moon_sets,
-                    obj.deep_sky_darkness_moon_always_down,
-                    obj.deep_sky_darkness_moon_always_up,
-                    str(round(obj.night_duration_astronomical / 3600, 2)),
-                    str(round(obj.deep_sky_darkness / 3600, 2)),
+                print_table(rows, MOON_HEADERS)
+
+                print("UpTonight:")
+                rows = [
+                    [
+                        obj.uptonight,
+                        obj.uptonight_list[0].target_name,
+                        obj.uptonight_bodies,
+                        obj.uptonight_bodies_list[0].target_name,
+                        obj.uptonight_comets,
+                        obj.uptonight_comets_list[0].designation,
+                    ]
+                    for obj in data
                 ]
-                for obj in data
-            ]
-            print(f"{esc(COLOR_BLUE)}" + f"{tabulate(rows, headers=headers)}" + f"{esc('0')}\n")
-
-            print("Sun:")
-            headers = [
-                "altitude",
-                "azimuth",
-                "next_rising",
-                "next_rising_nautical",
-                "next_rising_astro",
-                "next_setting",
-                "next_setting_nautical",
-                "next_setting_astro",
-                "constellation",
-            ]
-            rows = [
-                [
-                    obj.sun_altitude,
-                    obj.sun_azimuth,
-                    obj.sun_next_rising.strftime("%Y-%m-%d %H:%M"),
-                    obj.sun_next_rising_nautical.strftime("%Y-%m-%d %H:%M"),
-                    obj.sun_next_rising_astro.strftime("%Y-%m-%d %H:%M"),
-                    obj.sun_next_setting.strftime("%Y-%m-%d %H:%M"),
-                    obj.sun_next_setting_nautical.strftime("%Y-%m-%d %H:%M"),
-                    obj.sun_next_setting_astro.strftime("%Y-%m-%d %H:%M"),
-                    obj.sun_constellation,
-                ]
-                for obj in data
-            ]
-            print(f"{esc(COLOR_BLUE)}" + f"{tabulate(rows, headers=headers)}" + f"{esc('0')}\n")
-
-            print("Moon:")
-            headers = [
-                "altitude",
-                "azimuth",
-                "phase",
-                "next_rising",
-                "next_setting",
-                "next_new_moon",
-                "next_full_moon",
-                "distance_km",
-                "angular_size",
-                "relative_distance",
-                "relative_size",
-                "constellation",
-            ]
-            rows = [
-                [
-                    obj.moon_altitude,
-                    obj.moon_azimuth,
-                    obj.moon_phase,
-                    obj.moon_next_rising.strftime("%Y-%m-%d %H:%M"),
-                    obj.moon_next_setting.strftime("%Y-%m-%d %H:%M"),
-                    obj.moon_next_new_moon.strftime("%Y-%m-%d %H:%M"),
-                    obj.moon_next_full_moon.strftime("%Y-%m-%d %H:%M"),
-                    obj.moon_distance_km,
-                    obj.moon_angular_size,
-                    obj.moon_relative_distance,
-                    obj.moon_relative_size,
-                    obj.moon_constellation,
-                ]
-                for obj in data
-            ]
-            print(f"{esc(COLOR_BLUE)}" + f"{tabulate(rows, headers=headers)}" + f"{esc('0')}\n")
-
-            print("UpTonight:")
-            headers = [
-                "dsos",
-                "name",
-                "bodies",
-                "name",
-                "comets",
-                "designation",
-            ]
-            rows = [
-                [
-                    obj.uptonight,
-                    obj.uptonight_list[0].target_name,
-                    obj.uptonight_bodies,
-                    obj.uptonight_bodies_list[0].target_name,
-                    obj.uptonight_comets,
-                    obj.uptonight_comets_list[0].designation,
-                ]
-                for obj in data
-            ]
-            print(f"{esc(COLOR_BLUE)}" + f"{tabulate(rows, headers=headers)}" + f"{esc('0')}\n")
+                print_table(rows, UPTONIGHT_HEADERS)
 
-    except AstroWeatherError as err:
-        print(err)
+        except AstroWeatherError as err:
+            print(err, file=sys.stderr if JSON_OUTPUT else sys.stdout)
 
-    end = time.time()
+    end = time.perf_counter()
 
-    print(f"Execution time: {end - start} seconds")
+    print(f"Execution time: {end - start:.3f} seconds", file=sys.stderr if JSON_OUTPUT else sys.stdout)
 
     return None
 
 
-for location in LOCATIONS:
-    latitude = location["latitude"]
-    longitude = location["longitude"]
-    elevation = location["elevation"]
-    timezone_info = location["timezone_info"]
+async def run_locations() -> None:
+    """Run the example for every location in one event loop."""
+    for location in locations():
+        await main(location)
+
 
-    asyncio.run(main())
+if __name__ == "__main__":
+    use_uvloop()
+    asyncio.run(run_locations())
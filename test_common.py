@@ -0,0 +1,83 @@
+"""Helpers shared by the API test scripts"""
+
+import asyncio
+import logging
+import os
+import sys
+from collections import namedtuple
+from datetime import timezone
+
+# Colors on a terminal only, captured output and NO_COLOR get plain text
+USE_COLOR = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+
+
+def _color(code):
+    return f"\033[{code}m" if USE_COLOR else ""
+
+
+COLOR_BLACK = _color("1;30")
+COLOR_RED = _color("1;31")
+COLOR_GREEN = _color("1;32")
+COLOR_BROWN = _color("1;33")
+COLOR_BLUE = _color("1;34")
+COLOR_PURPLE = _color("1;35")
+COLOR_CYAN = _color("1;36")
+COLOR_RESET = _color("0")
+
+Location = namedtuple("Location", "latitude longitude elevation timezone_info")
+
+
+def use_uvloop():
+    """Runs the event loops on uvloop if it is installed, it is not a dependency of the library"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def setup_logging(logger):
+    """Configures logging from ASTROWEATHER_LOG, WARNING by default
+
+    DEBUG logging is a known heavy path, every record of the library is formatted and written
+    to stderr, so it is only enabled on request, ASTROWEATHER_DEBUG=1 is a shortcut for it.
+    The HTTP and event loop internals stay quiet.
+    """
+    if os.environ.get("ASTROWEATHER_DEBUG") == "1":
+        name = "DEBUG"
+    else:
+        name = os.environ.get("ASTROWEATHER_LOG", "WARNING").upper()
+    # getLevelName() maps a level name to its number and returns a string for anything else
+    level = logging.getLevelName(name)
+    valid = isinstance(level, int)
+    logging.basicConfig(level=level if valid else logging.WARNING)
+    for library in ("aiohttp", "asyncio", "urllib3"):
+        logging.getLogger(library).setLevel(logging.WARNING)
+    logger.setLevel(logging.DEBUG)
+    if not valid:
+        logger.warning("Unknown log level %s in ASTROWEATHER_LOG, using WARNING", name)
+
+
+def backyard_location():
+    """Returns the backyard location configured in the environment"""
+    try:
+        return Location(
+            float(os.environ["BACKYARD_LATITUDE"]),
+            float(os.environ["BACKYARD_LONGITUDE"]),
+            int(os.environ["BACKYARD_ELEVATION"]),
+            os.environ["BACKYARD_TIMEZONE"],
+        )
+    except KeyError as err:
+        raise SystemExit(f"Environment variable {err} is not set, it is required for the backyard location") from err
+
+
+def utc_to_local(utc_dt, local_tz):
+    """Localizes the datetime"""
+    return utc_dt.replace(tzinfo=timezone.utc).astimezone(local_tz)
+
+
+def convert_to_hhmm(sec):
+    hour, sec = divmod(sec % 86400, 3600)
+    minute = sec // 60
+
+    return f"{int(hour):02d}:{int(minute):02d}"
@@ -2,33 +2,48 @@
 """The test for the API"""
 
 import asyncio
-import pprint
+import csv
 import logging
 import time
 import os
+import pathlib
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
+
+from aiohttp import ClientSession, ClientTimeout
+
 from pyastroweatherio import (
     AstroWeather,
     AstroWeatherError,
 )
+from pyastroweatherio.const import DEFAULT_TIMEOUT
+from test_common import (
+    COLOR_BLUE,
+    COLOR_GREEN,
+    COLOR_RED,
+    convert_to_hhmm,
+    setup_logging,
+    use_uvloop,
+    utc_to_local,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-pp = pprint.PrettyPrinter()
-COLOR_BLACK = "1;30"
-COLOR_RED = "1;31"
-COLOR_GREEN = "1;32"
-COLOR_BROWN = "1;33"
-COLOR_BLUE = "1;34"
-COLOR_PURPLE = "1;35"
-COLOR_CYAN = "1;36"
+# Console line per sweep step and the format of its times, shared with the CSV rows
+ROW_TEMPLATE = (
+    f"{COLOR_RED}Date & Time: {COLOR_GREEN}{{dt}}{COLOR_BLUE} - "
+    + "SS {ss}; SR {sr}; SSA {ssa}; SRA {sra}; MR {mr}; MS {ms}; "
+)
+TIME_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+# Set ASTROWEATHER_VERBOSE=0 to write the CSV only and skip the console line per sweep step
+VERBOSE = os.environ.get("ASTROWEATHER_VERBOSE", "1") == "1"
 
 # Backyard
-latitude = float(os.environ["BACKYARD_LATITUDE"])
-longitude = float(os.environ["BACKYARD_LONGITUDE"])
-elevation = int(os.environ["BACKYARD_ELEVATION"])
-timezone_info = os.environ["BACKYARD_TIMEZONE"]
+# latitude = float(os.environ["BACKYARD_LATITUDE"])
+# longitude = float(os.environ["BACKYARD_LONGITUDE"])
+# elevation = int(os.environ["BACKYARD_ELEVATION"])
+# timezone_info = os.environ["BACKYARD_TIMEZONE"]
 
 # Peißenberg
 # latitude=48.811
@@ -60,140 +75,112 @@ timezone_info = "Chile/Continental"
 # elevation=3
 # timezone_info = "Australia/Sydney"
 
+# The location is fixed for the whole sweep, so its timezone is looked up once
+LOCAL_TZ = ZoneInfo(timezone_info)
 
-def esc(code):
-    return f"\033[{code}m"
 
-
-def utc_to_local(utc_dt):
-    """Localizes the datetime"""
-    local_tz = pytz.timezone(timezone_info)
-    local_dt = utc_dt.replace(tzinfo=pytz.utc).astimezone(local_tz)
-    return local_tz.normalize(local_dt)
-
-
-def convert_to_hhmm(sec):
-    sec = sec % (24 * 3600)
-    hour = sec // 3600
-    sec %= 3600
-    min = sec // 60
-    sec %= 60
-    #    return "%02d:%02d:%02d" % (hour, min, sec)
-    return "%02d:%02d" % (hour, min)
+def decimal_comma(value):
+    """Formats a number with the decimal comma the CSV is read with"""
+    return format(value, "").replace(".", ",")
 
 
 async def main() -> None:
     """Create the aiohttp session and run the example."""
-    logging.basicConfig(level=logging.DEBUG)
+    setup_logging(_LOGGER)
 
-    f = open("debug/test_dsd.csv", "w")
+    # The CSV and, in test mode, the library's raw API responses are written here
+    debug_dir = pathlib.Path("debug")
+    debug_dir.mkdir(exist_ok=True)
 
-    f.write(
-        "Datetime;Sun next Rising;Sun next Rising Astronomical;Sun next Setting;Sun next Setting Astronomical;Moon next Rising;Moon next Setting;Sun Altitude;Moon Altitude;DSD Moon rises;DSD Moon sets;DSD Moon always up;DSD Moon always down;NDA;DSD\n"
-    )
+    # Rows are collected and written at once when the sweep is done
+    csv_rows = []
 
     ds_string = "11/13/2023 00:00:00"
     dt = datetime.strptime(ds_string, "%m/%d/%Y %H:%M:%S")
     de_string = "11/15/2023 00:00:00"
     de = datetime.strptime(de_string, "%m/%d/%Y %H:%M:%S")
 
-    start = time.time()
-
-    while dt < de:
-        astroweather = AstroWeather(
-            latitude=latitude,
-            longitude=longitude,
-            elevation=elevation,
-            timezone_info=timezone_info,
-            cloudcover_weight=3,
-            seeing_weight=2,
-            transparency_weight=1,
-            uptonight_path=".",
-            test_datetime=dt,
-        )
-
-        try:
-            data = await astroweather.get_location_data()
-            for row in data:
-                print(
-                    f"{esc(COLOR_RED)}Date & Time: {esc(COLOR_GREEN)}{str(utc_to_local(dt))}{esc(COLOR_BLUE)}"
-                    + " - "
-                    + "SS "
-                    + str(datetime.strftime(utc_to_local(row.sun_next_setting), "%d.%m.%Y %H:%M:%S"))
-                    + "; "
-                    + "SR "
-                    + str(datetime.strftime(utc_to_local(row.sun_next_rising), "%d.%m.%Y %H:%M:%S"))
-                    + "; "
-                    + "SSA "
-                    + str(
-                        datetime.strftime(
-                            utc_to_local(row.sun_next_setting_astro),
-                            "%d.%m.%Y %H:%M:%S",
-                        )
-                    )
-                    + "; "
-                    + "SRA "
-                    + str(datetime.strftime(utc_to_local(row.sun_next_rising_astro), "%d.%m.%Y %H:%M:%S"))
-                    + "; "
-                    + "MR "
-                    + str(datetime.strftime(utc_to_local(row.moon_next_rising), "%d.%m.%Y %H:%M:%S"))
-                    + "; "
-                    + "MS "
-                    + str(datetime.strftime(utc_to_local(row.moon_next_setting), "%d.%m.%Y %H:%M:%S"))
-                    + "; "
-                )
-
-                f.write(
-                    str(datetime.strftime(utc_to_local(dt), "%d.%m.%Y %H:%M:%S"))
-                    + ";"
-                    + str(datetime.strftime(utc_to_local(row.sun_next_rising), "%d.%m.%Y %H:%M:%S"))
-                    + ";"
-                    + str(datetime.strftime(utc_to_local(row.sun_next_rising_astro), "%d.%m.%Y %H:%M:%S"))
-                    + ";"
-                    + str(datetime.strftime(utc_to_local(row.sun_next_setting), "%d.%m.%Y %H:%M:%S"))
-                    + ";"
-                    + str(
-                        datetime.strftime(
-                            utc_to_local(row.sun_next_setting_astro),
-                            "%d.%m.%Y %H:%M:%S",
+    start = time.perf_counter()
+
+    # One session for the whole sweep, so connections to the APIs are reused by every step
+    async with ClientSession(timeout=ClientTimeout(total=DEFAULT_TIMEOUT)) as session:
+        while dt < de:
+            astroweather = AstroWeather(
+                session=session,
+                latitude=latitude,
+                longitude=longitude,
+                elevation=elevation,
+                timezone_info=timezone_info,
+                cloudcover_weight=3,
+                seeing_weight=2,
+                transparency_weight=1,
+                uptonight_path=".",
+                test_datetime=dt,
+            )
+
+            try:
+                data = await astroweather.get_location_data()
+                # Localize and format every timestamp once, the console line and the CSV row share them
+                dt_local = utc_to_local(dt, LOCAL_TZ)
+                dt_local_str = dt_local.strftime(TIME_FORMAT)
+                for row in data:
+                    sun_next_setting = utc_to_local(row.sun_next_setting, LOCAL_TZ).strftime(TIME_FORMAT)
+                    sun_next_rising = utc_to_local(row.sun_next_rising, LOCAL_TZ).strftime(TIME_FORMAT)
+                    sun_next_setting_astro = utc_to_local(row.sun_next_setting_astro, LOCAL_TZ).strftime(TIME_FORMAT)
+                    sun_next_rising_astro = utc_to_local(row.sun_next_rising_astro, LOCAL_TZ).strftime(TIME_FORMAT)
+                    moon_next_rising = utc_to_local(row.moon_next_rising, LOCAL_TZ).strftime(TIME_FORMAT)
+                    moon_next_setting = utc_to_local(row.moon_next_setting, LOCAL_TZ).strftime(TIME_FORMAT)
+
+                    if VERBOSE:
+                        print(
+                            ROW_TEMPLATE.format(
+                                dt=dt_local,
+                                ss=sun_next_setting,
+                                sr=sun_next_rising,
+                                ssa=sun_next_setting_astro,
+                                sra=sun_next_rising_astro,
+                                mr=moon_next_rising,
+                                ms=moon_next_setting,
+                            )
                         )
+
+                    csv_rows.append(
+                        [
+                            dt_local_str,
+                            sun_next_rising,
+                            sun_next_rising_astro,
+                            sun_next_setting,
+                            sun_next_setting_astro,
+                            moon_next_rising,
+                            moon_next_setting,
+                            decimal_comma(row.sun_altitude),
+                            decimal_comma(row.moon_altitude),
+                            row.deep_sky_darkness_moon_rises,
+                            row.deep_sky_darkness_moon_sets,
+                            row.deep_sky_darkness_moon_always_up,
+                            row.deep_sky_darkness_moon_always_down,
+                            convert_to_hhmm(row.night_duration_astronomical),
+                            convert_to_hhmm(row.deep_sky_darkness),
+                            str(row.deepsky_forecast_today_plain),
+                            str(row.deepsky_forecast_tomorrow_plain),
+                        ]
                     )
-                    + ";"
-                    + str(datetime.strftime(utc_to_local(row.moon_next_rising), "%d.%m.%Y %H:%M:%S"))
-                    + ";"
-                    + str(datetime.strftime(utc_to_local(row.moon_next_setting), "%d.%m.%Y %H:%M:%S"))
-                    + ";"
-                    + str(row.sun_altitude).replace(".", ",")
-                    + ";"
-                    + str(row.moon_altitude).replace(".", ",")
-                    + ";"
-                    + str(row.deep_sky_darkness_moon_rises)
-                    + ";"
-                    + str(row.deep_sky_darkness_moon_sets)
-                    + ";"
-                    + str(row.deep_sky_darkness_moon_always_up)
-                    + ";"
-                    + str(row.deep_sky_darkness_moon_always_down)
-                    + ";"
-                    + convert_to_hhmm(row.night_duration_astronomical)
-                    + ";"
-                    + convert_to_hhmm(row.deep_sky_darkness)
-                    + ";"
-                    + str(row.deepsky_forecast_today_plain)
-                    + ";"
-                    + str(row.deepsky_forecast_tomorrow_plain)
-                    + "\n"
-                )
-        except AstroWeatherError as err:
-            print(err)
-
-        dt = dt + timedelta(minutes=15)
-
-    f.close()
-
-    end = time.time()
-
-    print(f"Execution time: %s seconds", end - start)
-
-
-asyncio.run(main())
+            except AstroWeatherError as err:
+                print(err)
+
+            dt = dt + timedelta(minutes=15)
+
+    with open(debug_dir / "test_dsd.csv", "w", buffering=1 << 20, newline="") as f:
+        f.write(
+            "Datetime;Sun next Rising;Sun next Rising Astronomical;Sun next Setting;Sun next Setting Astronomical;Moon next Rising;Moon next Setting;Sun Altitude;Moon Altitude;DSD Moon rises;DSD Moon sets;DSD Moon always up;DSD Moon always down;NDA;DSD\n"
+        )
+        csv.writer(f, delimiter=";", lineterminator="\n").writerows(csv_rows)
+
+    end = time.perf_counter()
+
+    _LOGGER.info("Execution time: %.3f seconds", end - start)
+
+
+if __name__ == "__main__":
+    use_uvloop()
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""The test for the risings and settings reused by the astronomical routines"""
+
+from datetime import datetime, timedelta
+
+from pyastroweatherio.dataclasses import GeoLocationData
+from pyastroweatherio.helper_functions import AstronomicalRoutines
+
+# Events of a fresh instance may differ by ephem's iteration noise only
+TOLERANCE_SECONDS = 1
+
+LONGYEARBYEN = {"latitude": 78.22, "longitude": 15.65, "elevation": 10, "timezone_info": "Arctic/Longyearbyen"}
+MCMURDO = {"latitude": -77.85, "longitude": 166.67, "elevation": 10, "timezone_info": "Antarctica/McMurdo"}
+
+# Location, first and later forecast time of an instance, the Moon only grazes the horizon
+GRAZING_CASES = (
+    (LONGYEARBYEN, datetime(2024, 7, 5, 12, 0), datetime(2024, 7, 6, 0, 0)),
+    (LONGYEARBYEN, datetime(2024, 7, 9, 19, 0), datetime(2024, 7, 10, 1, 0)),
+    (MCMURDO, datetime(2024, 12, 17, 8, 0), datetime(2024, 12, 17, 13, 0)),
+    (MCMURDO, datetime(2024, 12, 20, 8, 0), datetime(2024, 12, 20, 10, 0)),
+)
+
+# Location and start of a sweep in 30 minute steps over a day
+SWEEPS = (
+    (LONGYEARBYEN, datetime(2024, 1, 16, 22, 0)),
+    (LONGYEARBYEN, datetime(2024, 7, 5, 0, 0)),
+    (MCMURDO, datetime(2024, 12, 17, 0, 0)),
+)
+
+
+def astronomical_data(routines):
+    """Returns the sun, moon and darkness data of the routines by name"""
+    data = {}
+    for prefix, values in (
+        ("sun_", routines.sun_data()),
+        ("moon_", routines.moon_data()),
+        ("darkness_", routines.darkness_data()),
+    ):
+        data.update({prefix + key: value for key, value in vars(values).items()})
+    return data
+
+
+def assert_same_as_fresh(location, routines, forecast_time):
+    """Compares the data of the reused routines with the one of a fresh instance"""
+    routines.need_update(forecast_time=forecast_time)
+    reused = astronomical_data(routines)
+    fresh_routines = AstronomicalRoutines(GeoLocationData(data=location), forecast_time)
+    fresh_routines.need_update()
+    fresh = astronomical_data(fresh_routines)
+
+    for key, value in fresh.items():
+        if isinstance(value, datetime) and isinstance(reused[key], datetime):
+            difference = abs((reused[key] - value).total_seconds())
+        elif isinstance(value, float):
+            difference = abs(reused[key] - value)
+        else:
+            assert reused[key] == value, f"{key} at {forecast_time}: {reused[key]} != {value}"
+            continue
+        assert difference <= TOLERANCE_SECONDS, f"{key} at {forecast_time}: {reused[key]} != {value}"
+
+
+def test_reused_events_while_grazing():
+    for location, first, later in GRAZING_CASES:
+        routines = AstronomicalRoutines(GeoLocationData(data=location), first)
+        routines.need_update()
+        astronomical_data(routines)
+        assert_same_as_fresh(location, routines, later)
+
+
+def test_reused_events_in_sweep():
+    for location, start in SWEEPS:
+        routines = AstronomicalRoutines(GeoLocationData(data=location), start)
+        for step in range(48):
+            assert_same_as_fresh(location, routines, start + timedelta(minutes=30 * step))
+
+
+if __name__ == "__main__":
+    test_reused_events_while_grazing()
+    test_reused_events_in_sweep()
+    print("Reused events match fresh calculations")